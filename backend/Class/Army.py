@@ -1,43 +1,256 @@
-from math import sin
-from math import cos
+import itertools
+import time
 
 from backend.Class.Map import Map
 from backend.Class.Action import Action
-import random  # NEW: for ranged dodge rolls
+from backend.Class.Event import Event
+from backend.Class.Squad import Squad
 
-from backend.Class.Units.Castle import Castle
 from backend.Class.Units.Elephant import Elephant
 from backend.Class.Units.Monk import Monk
 from backend.Class.Units.Unit import Unit
+from backend.Utils.combat import COMBAT_TABLE, resolve_attacks
+from backend.Utils.nearest import NearestIndex
+from backend.Utils.snapshot import BattleSnapshot
+from backend.Utils.steering import first_free_direction, rotated_candidates
 
 
 class Army:
     def __init__(self):
         self.gameMode = None
         self.general = None
-        self.units = []  # list of Unit objects
+        # membres de l'armée (dict = ensemble ordonné) : ajout et retrait en O(1), utile aux conversions
+        self._members = {}
+        self._units_cache = None
+        # vivants / morts tenus à jour au fil des changements de PV (dict = ensemble ordonné)
+        self._living = {}
+        self._dead = {}
+        self._living_cache = None
+        # vivants rangés par type exact (même ordre relatif que _living), pour les listes par type des généraux
+        self._living_by_type = {}
+        # rang d'entrée dans _living, pour rendre les sous-ensembles dans l'ordre des vivants
+        self._rank = {}
+        self._ranks = itertools.count()
+        # vivants blessés (hp < max_hp), tenus à jour à chaque changement de PV (soins, dégâts, piétinement)
+        self._wounded = {}
+        # escouades (backend/Class/Squad.py) : nom -> escouade, et unité -> son escouade
+        self.squads = {}
+        self._squad_of = {}
+        self.influence = None  # InfluenceMap de l'armée quand la bataille en tient une (backend/Utils/influence.py)
+        # unités endormies : le général les a déclarées sans rien à faire, elles sont sautées
+        # jusqu'à un évènement qui les réveille (attaquées, ennemi en vue, nouvel ennemi)
+        self._asleep = {}
+        self._sleep_los = 0
+        self._active_cache = None
+        self.events = []  # évènements du dernier execOrder (piétinements, ...)
+        self.event_counts = {}  # total par type depuis le début de la bataille
+        # horloge de l'armée : +1 à chaque execOrder, les recharges sont stockées en "prête au tick T"
+        self.clock = 0
+        self.progressed = False  # vrai si le dernier execOrder a changé des PV, des positions ou un camp
+        self._last_targets = []  # ordres du général au dernier tour, rejoués s'il dépasse son budget
 
     def add_unit(self, unit: Unit):
+        # la recharge restante est relative à l'horloge de l'ancienne armée : on la reporte sur la nôtre
+        cooldown = unit.cooldown
         unit.army = self
-        self.units.append(unit)
+        unit.cooldown = cooldown
+        self._members[unit] = None
+        self._units_cache = None
+        if unit.is_alive():
+            self._add_living(unit)
+        else:
+            self._dead[unit] = None
+        self._living_cache = None
+        self._active_cache = None
 
     def remove_unit(self, unit):
-        for i in range(len(self.units)):
-            if self.units[i] == unit :
-                del self.units[i]
-                break
+        if self._members.pop(unit, 0) is not None:
+            return
+        self._units_cache = None
+        self._drop_living(unit)
+        self._dead.pop(unit, None)
+        self._living_cache = None
+        self._active_cache = None
+        self.wake(unit)
+
+    @property
+    def units(self):
+        # toutes les unités (mortes comprises) dans l'ordre d'ajout ; liste partagée : ne pas la modifier
+        if self._units_cache is None:
+            self._units_cache = list(self._members)
+        return self._units_cache
+
+    def on_life_change(self, unit):
+        # Appelé par Unit.hp quand une unité passe à 0 PV (ou revient au-dessus)
+        if unit.is_alive():
+            self._dead.pop(unit, None)
+            self._add_living(unit)
+        else:
+            self._drop_living(unit)
+            self._dead[unit] = None
+            self.wake(unit)
+        self._living_cache = None
+        self._active_cache = None
+        grid = self._spatial_grid()
+        if grid is not None:
+            if unit.is_alive():
+                grid.insert(unit)
+            else:
+                grid.remove(unit)
+
+    def on_hp_change(self, unit):
+        # Appelé par Unit.hp pour une unité qui reste en vie : elle entre ou sort des blessés
+        if unit not in self._living:
+            return
+        if unit.hp < unit.max_hp:
+            self._wounded[unit] = None
+        else:
+            self._wounded.pop(unit, None)
+
+    def _add_living(self, unit):
+        if unit not in self._living:
+            self._living[unit] = None
+            self._rank[unit] = next(self._ranks)
+            self._living_by_type.setdefault(unit.__class__, {})[unit] = None
+        if unit.hp < unit.max_hp:
+            self._wounded[unit] = None
+
+    def _drop_living(self, unit):
+        self._living.pop(unit, None)
+        self._rank.pop(unit, None)
+        self._living_by_type.get(unit.__class__, {}).pop(unit, None)
+        self._wounded.pop(unit, None)
+        if self._squad_of:
+            # morte ou convertie : elle quitte son escouade
+            self.unassign(unit)
+
+    # --- escouades --------------------------------------------------------------
+    def create_squad(self, name, units=()):
+        """Squad `name` of this army (created if needed), with `units` moved into it."""
+        squad = self.squads.get(name)
+        if squad is None:
+            squad = self.squads[name] = Squad(name)
+            squad.army = self
+        for unit in units:
+            self.assign(unit, squad)
+        return squad
+
+    def assign(self, unit, squad):
+        """Put a living unit of this army in `squad` (a unit is in one squad at most)."""
+        if not self.is_living(unit) or squad.army is not self:
+            return
+        self.unassign(unit)
+        squad._members[unit] = None
+        self._squad_of[unit] = squad
+
+    def unassign(self, unit):
+        squad = self._squad_of.pop(unit, None)
+        if squad is not None:
+            squad._members.pop(unit, None)
+
+    def squad_of(self, unit):
+        return self._squad_of.get(unit)
+
+    def disband(self, name):
+        squad = self.squads.pop(name, None)
+        if squad is not None:
+            for unit in squad._members:
+                self._squad_of.pop(unit, None)
+            squad._members.clear()
+
+    def wounded_units(self):
+        """Living units below max_hp, in living order (new list, built from the wounded index only)."""
+        return sorted(self._wounded, key=self._rank.__getitem__)
+
+    def wounded_count(self):
+        return len(self._wounded)
 
     def isEmpty(self):
-        return len(self.living_units()) <= 0
+        return not self._living
+
+    def alive_count(self):
+        return len(self._living)
+
+    def is_living(self, unit):
+        """Test d'appartenance en O(1) : l'unité est vivante et dans cette armée."""
+        return unit in self._living
 
     def living_units(self):
-        return [u for u in self.units if u.is_alive()]
+        # liste partagée entre les appels du même tick : ne pas la modifier
+        if self._living_cache is None:
+            self._living_cache = list(self._living)
+        return self._living_cache
+
+    def living_of(self, cls):
+        """Living units that are instances of `cls`, in living order (new list, no scan of the whole army)."""
+        buckets = [bucket for kind, bucket in self._living_by_type.items() if issubclass(kind, cls)]
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            return list(buckets[0])
+        # plusieurs types concrets (cls = classe de base) : on garde l'ordre des vivants
+        return [u for u in self.living_units() if isinstance(u, cls)]
+
+    def count_of(self, cls):
+        return sum(len(bucket) for kind, bucket in self._living_by_type.items() if issubclass(kind, cls))
+
+    def active_units(self):
+        """Living units that are not asleep, in living order (shared list, do not modify)."""
+        if not self._asleep:
+            return self.living_units()
+        if self._active_cache is None:
+            asleep = self._asleep
+            self._active_cache = [u for u in self.living_units() if u not in asleep]
+        return self._active_cache
+
+    def sleep(self, unit):
+        """
+        Skip `unit` in active_units() until something could change its decision:
+        it is attacked or trampled, an enemy moves within its line_of_sight, or a
+        unit is converted to the enemy side. Only for units the general gave no target.
+        """
+        if unit in self._asleep or unit.position is None or not self.is_living(unit):
+            return
+        self._asleep[unit] = None
+        if unit.line_of_sight > self._sleep_los:
+            self._sleep_los = unit.line_of_sight
+        self._active_cache = None
+
+    def wake(self, unit):
+        if self._asleep.pop(unit, 0) is None:
+            self._active_cache = None
+            if not self._asleep:
+                self._sleep_los = 0
+
+    def wake_all(self):
+        if self._asleep:
+            self._asleep.clear()
+            self._sleep_los = 0
+            self._active_cache = None
+
+    def is_asleep(self, unit):
+        return unit in self._asleep
+
+    def enemy_moved(self, enemy):
+        # Réveille les unités endormies qui voient maintenant `enemy`
+        if not self._asleep or enemy.position is None:
+            return
+        ex, ey = enemy.position
+        grid = self._spatial_grid()
+        if grid is not None:
+            candidates = [u for u in grid.query_radius(ex, ey, self._sleep_los) if u in self._asleep]
+        else:
+            candidates = list(self._asleep)
+        for unit in candidates:
+            x, y = unit.position
+            if (x - ex) ** 2 + (y - ey) ** 2 <= unit.line_of_sight ** 2:
+                self.wake(unit)
 
     def moving_units(self):
         return [u for u in self.living_units() if u.speed > 0]
 
     def dead_units(self):
-        return [u for u in self.units if not u.is_alive()]
+        return list(self._dead)
 
     def testTargets(self, targets, map: Map, otherArmy):
         # Le générale donne juste des cibles, il associe une unité à une unité adverse
@@ -58,23 +271,21 @@ class Army:
                 dy = ty - uy
                 dist2 = dx * dx + dy * dy
 
-                # print(unit, target, dist2, unit.range,dist2 <= unit.range **2)
-                range_ = unit.range
-                if isinstance(unit, Monk) and (isinstance(target, Elephant) or isinstance(target, Castle)) :
-                    range_ = unit.convert_range
-
-
+                # portée d'engagement (range + tailles, portée de conversion des moines) précalculée par type
                 # ATTAQUE
-                if dist2 <= (range_+ unit.size/2 + target.size/2) ** 2:
+                if dist2 <= COMBAT_TABLE.engage_r2(unit, target):
                     if isinstance(unit, Monk):
-                        if target in otherArmy.living_units() :
+                        if otherArmy.is_living(target) :
                             if unit.cooldown <= 0:
                                 actions.append(Action(unit, "conversion", target))
-                        elif target in self.living_units() and target != unit:
+                        elif self.is_living(target) and target != unit:
                             actions.append(Action(unit, "heal", target))
-                    elif target in otherArmy.living_units():
+                    elif otherArmy.is_living(target):
                         if unit.cooldown <= 0:
                             actions.append(Action(unit, "attack", target))
+                elif unit.speed <= 0:
+                    # unité immobile (château) : hors de portée il n'y a rien à faire
+                    continue
                 else:
                     vector = (dx / (dist2 ** 0.5) * unit.speed,dy / (dist2 ** 0.5) * unit.speed)
                     #print(vector)
@@ -100,19 +311,92 @@ class Army:
                         )
         return actions
 
+    def expand_squads(self, targets, view, otherArmy):
+        """
+        Turn the orders of the squads into per-unit targets and moves.
+        Members of a squad with an order get it instead of their target from the general;
+        an order whose target died / changed side or whose followed squad is empty is dropped.
+        Returns (targets, moves) with moves a list of (unit, (x, y)).
+        """
+        squad_targets = []
+        moves = []
+        commanded = {}
+        for squad in self.squads.values():
+            order = squad.order
+            if order is None or squad.is_empty():
+                continue
+            units = [u for u in squad.units if u.position is not None]
+            if order.kind == "attack":
+                if not otherArmy.is_living(order.target):
+                    squad.order = None  # cible morte ou convertie : l'escouade revient au général
+                    continue
+                squad_targets.extend((u, order.target) for u in units)
+            elif order.kind == "hold":
+                intruders = view.index(True).within(order.position, order.radius)
+                if intruders:
+                    index = NearestIndex(intruders)
+                    squad_targets.extend((u, index.nearest(u.position)) for u in units)
+                else:
+                    moves.extend((u, order.position) for u in units
+                                 if _distance_sq(u.position, order.position) > order.radius ** 2)
+            elif order.kind == "follow":
+                leader = order.target
+                centre = leader.centroid() if leader is not squad else None
+                if centre is None:
+                    squad.order = None
+                    continue
+                moves.extend((u, centre) for u in units if _distance_sq(u.position, centre) > order.radius ** 2)
+            commanded.update(squad._members)
+
+        if not commanded:
+            return targets, moves
+        if isinstance(targets, dict):
+            targets = targets.items()
+        return [(u, t) for u, t in targets if u not in commanded] + squad_targets, moves
+
+    def moveOrders(self, moves, map: Map, otherArmy):
+        # Déplacements vers un point (ordres d'escouade) : même pas et même évitement que testTargets
+        actions = []
+        for unit, (tx, ty) in moves:
+            if unit.speed <= 0 or not self.is_living(unit):
+                continue
+            ux, uy = unit.position
+            dx = tx - ux
+            dy = ty - uy
+            dist = (dx * dx + dy * dy) ** 0.5
+            if dist == 0:
+                continue
+            step = min(unit.speed, dist)
+            vector = (dx / dist * step, dy / dist * step)
+            collision, vector = self.test_vector(unit, map, vector, otherArmy, 4)
+            if not collision:
+                actions.append(Action(unit, "move", (vector[0] + ux, vector[1] + uy)))
+        return actions
+
     def test_vector(self,unit,map,vector, otherArmy, profondeur):
+        # Essaie la direction voulue puis ses rotations (+-0.5, +-1, ... radians) et garde la premiere libre
         assert profondeur >=0
-        collision, find_vector = True, vector
-        if profondeur > 0:
-            collision, find_vector = self.test_vector(unit,map,vector, otherArmy, profondeur-1)
-        if not collision : return collision, find_vector
-        find_vector = vector[0] * cos(profondeur*0.5) - vector[1] * sin(profondeur*0.5), vector[0] * sin(profondeur*0.5) + vector[1] * cos(profondeur*0.5)
-        collision = self.try_collision(unit,map,find_vector,otherArmy)
-        if not collision: return collision, find_vector
-        find_vector = vector[0] * cos(-1*profondeur*0.5) - vector[1] * sin(-1*profondeur*0.5), vector[0] * sin(-1*profondeur*0.5) + vector[1] * cos(-1*profondeur*0.5)
-        return self.try_collision(unit,map,find_vector,otherArmy), find_vector
+        grid = self._spatial_grid()
+        if grid is None:
+            candidates = rotated_candidates(vector, profondeur)
+            for find_vector in candidates:
+                if not self.try_collision(unit, map, find_vector, otherArmy):
+                    return False, find_vector
+            return True, candidates[-1]
+
+        # tous les candidats tiennent dans un cercle de rayon |vector| : on recupere les obstacles une seule fois
+        reach = (vector[0] * vector[0] + vector[1] * vector[1]) ** 0.5
+        ux, uy = unit.position
+        low = reach + grid.max_size / 2 + 1e-6
+        high = reach + unit.size / 2 + 1e-6
+        blockers = list(self._blockers(grid, unit, otherArmy, ux - low, uy - low, ux + high, uy + high))
+        return first_free_direction(unit, vector, profondeur, blockers, self.test_collision)
 
     def try_collision(self,unit,map,vector, otherArmy):
+        grid = self._spatial_grid()
+        if grid is not None:
+            return self._try_collision_grid(grid, unit, vector, otherArmy)
+
         collisionE, collisionA, collisionO = False, False, False
         for allie in self.living_units():
             if allie != unit:
@@ -133,60 +417,95 @@ class Army:
 
         return collision
 
+    def _try_collision_grid(self, grid, unit, vector, otherArmy):
+        # Meme reponse que la boucle complete, mais on ne teste que les objets des cellules voisines.
+        # test_collision touche un objet ssi  ox - unit.size/2 < nx < ox + objet.size/2,
+        # donc il suffit de chercher les centres dans [nx - max_size/2, nx + unit.size/2].
+        nx = unit.position[0] + vector[0]
+        ny = unit.position[1] + vector[1]
+        low = grid.max_size / 2 + 1e-6
+        high = unit.size / 2 + 1e-6
+        for other in self._blockers(grid, unit, otherArmy, nx - low, ny - low, nx + high, ny + high):
+            if self.test_collision(vector, unit, other):
+                return True
+        return False
+
+    def _blockers(self, grid, unit, otherArmy, x_min, y_min, x_max, y_max):
+        # Objets de la grille qui peuvent bloquer `unit` : alliés vivants, ennemis vivants (sauf pour
+        # les éléphants qui passent à travers) et obstacles.
+        ignore_enemies = isinstance(unit, Elephant)
+        for other in grid.query_box(x_min, y_min, x_max, y_max):
+            if other is unit:
+                continue
+            if isinstance(other, Unit):
+                if not other.is_alive():
+                    continue
+                if other.army is not self and (ignore_enemies or other.army is not otherArmy):
+                    continue
+            yield other
+
+    def emit(self, event: Event):
+        self.events.append(event)
+        self.event_counts[event.kind] = self.event_counts.get(event.kind, 0) + 1
+
+    def trample(self, elephant, otherArmy):
+        # Un éléphant écrase les ennemis vivants à moins de 0.25 de lui
+        radius = 0.25
+        ex, ey = elephant.position
+        grid = self._spatial_grid()
+        if grid is not None:
+            candidates = grid.query_radius(ex, ey, radius)
+        else:
+            candidates = otherArmy.living_units()
+        victims = [
+            enemy for enemy in candidates
+            if otherArmy.is_living(enemy)
+            and (ex - enemy.position[0]) ** 2 + (ey - enemy.position[1]) ** 2 <= radius ** 2
+        ]
+        for enemy in victims:
+            enemy.hp -= elephant.attack
+            otherArmy.wake(enemy)
+        if victims:
+            if elephant.attack:
+                self.progressed = True
+            self.emit(Event("trample", elephant, victims, getattr(self.gameMode, "tick", None)))
+
+    def _spatial_grid(self):
+        # La grille appartient a la bataille ; sans bataille (simulations brutes) on garde la boucle complete
+        return getattr(self.gameMode, "spatial_grid", None)
+
 
 
 
     def execOrder(self, orders: Action, otherArmy: "Army"):
-        for unit in self.units:
-            if unit.cooldown > 0: unit.cooldown -= 1
+        # fait "décompter" la recharge de toutes les unités d'un coup (voir Unit.cooldown)
+        self.clock += 1
         # Cette fonction applique les dégâts avec les bonus sur l'armée adverse et
         # déplace des unités alliées à la bonne vitesse selon les ordres.
         """
         Applique les actions décidées par testTargets :
         - attaque : dégâts + cooldown
         - déplacement : mise à jour de la position
+        - éléphant : piétinement des ennemis proches (évènement "trample")
         """
+        self.events = []
+        self.progressed = False
 
+        # Les attaques sont mises de côté puis résolues en lot (voir backend/Utils/combat.py).
+        # Les conversions et le piétinement des éléphants dépendent des PV courants :
+        # on résout le lot en attente juste avant eux pour garder le même résultat qu'action par action.
+        attacks = []
         for action in orders:
 
             unit : Unit = action.unit
             target: Unit = action.target
             # ATTAQUE
             if action.kind == "attack":
-
-
-                bonus = 0
-                for classe in target.classes:
-                    bonus += unit.bonuses.get(classe, 0)
-
-                # Crossbow-specific dodge mechanic (rare miss, scales with target speed)
-                try:
-                    from backend.Class.Units.Crossbowman import Crossbowman
-                    is_crossbow = isinstance(unit, Crossbowman)
-                except Exception:
-                    is_crossbow = False
-
-                if is_crossbow:
-                    base_miss = 0.08  # 8% base dodge chance
-                    speed_factor = 0.015 * max(0, target.speed - 1)  # +1.5% per extra speed
-                    dodge_chance = min(0.20, base_miss + speed_factor)  # cap at 20%
-                    if random.random() < dodge_chance:
-                        # miss / dodge: only consume reload time
-                        unit.cooldown = unit.reload_time
-                        continue
-
-                # Compute applied damage (never heal)
-                damage = max(0, (unit.attack + bonus) - target.armor)
-                target.hp -= damage
-                if target.hp < 0:
-                    target.hp = 0
-
-                unit.last_attacked = target
-                target.last_attacker = unit
-                unit.cooldown = unit.reload_time
+                attacks.append(action)
 
             # DÉPLACEMENT
             elif action.kind == "move":
+                old_pos = unit.position
                 new_pos = action.target
                 # Clamp position to map bounds if map has dimensions
                 if unit.army and unit.army.gameMode and unit.army.gameMode.map:
@@ -199,32 +518,72 @@ class Army:
                         unit.position = new_pos
                 else:
                     unit.position = new_pos
+                if unit.position != old_pos:
+                    self.progressed = True
+                    grid = self._spatial_grid()
+                    if grid is not None:
+                        grid.move(unit)
+                    otherArmy.enemy_moved(unit)
             #Monk healing
             elif action.kind == "heal" :
-                target.hp = min(target.max_hp, target.hp+unit.attack)
+                old_hp = target.hp
+                target.hp = min(target.max_hp, old_hp+unit.attack)
+                if target.hp != old_hp:
+                    self.progressed = True
                 unit.last_attacked = "heal"
             #Monk convert
             elif action.kind == "conversion":
-                if target in otherArmy.living_units() :
+                self._flush_attacks(attacks, otherArmy)
+                attacks = []
+                if otherArmy.is_living(target) :
+                    self.progressed = True
                     otherArmy.remove_unit(target)
                     self.add_unit(target)
+                    # un nouvel ennemi apparaît pour l'autre armée (peut-être un ancien attaquant)
+                    otherArmy.wake_all()
                     unit.cooldown = unit.reload_time
                     target.last_attacker = None
                     target.last_attacked = None
                     unit.last_attacked = "conversion"
 
             if isinstance(unit, Elephant) :
-                for enemy in otherArmy.living_units():
-                    if (unit.position[0]-enemy.position[0])**2 + (unit.position[1]-enemy.position[1])**2 <= 0.25**2 :
-                        enemy.hp-=unit.attack
+                self._flush_attacks(attacks, otherArmy)
+                attacks = []
+                self.trample(unit, otherArmy)
+        self._flush_attacks(attacks, otherArmy)
+
+    def _flush_attacks(self, attacks, otherArmy):
+        for action in attacks:
+            otherArmy.wake(action.target)
+        if resolve_attacks(attacks):
+            self.progressed = True
 
     def fight(self, map: Map, otherArmy):
         # print("me",len(self.living_units()), len(otherArmy.living_units()))
 
-        targets = self.general.getTargets(map, otherArmy)
+        general = self.general
+        budget = getattr(self.gameMode, "decision_budget", None)
+        # vue figée du champ de bataille pour ce tour, partagée par tout getTargets
+        view = general.snapshot = BattleSnapshot(self, otherArmy, getattr(self.gameMode, "tick", None))
+        start = time.perf_counter()
+        try:
+            targets = general.decide(map, otherArmy)
+        finally:
+            general.snapshot = None
+        if general.timer.record(time.perf_counter() - start, budget):
+            # décision trop lente : la bataille applique son budget_mode (None = forfait)
+            targets = self.gameMode.decision_overrun(self, targets)
+            if targets is None:
+                return
+        self._last_targets = targets
+        moves = []
+        if self.squads:
+            targets, moves = self.expand_squads(targets, view, otherArmy)
         #print("me", len(self.living_units()), len(otherArmy.living_units()))
         #print("targets" ,targets)
         orders = self.testTargets(targets, map, otherArmy)
+        if moves:
+            orders += self.moveOrders(moves, map, otherArmy)
         #print("me", len(self.living_units()), len(otherArmy.living_units()))
         #print("orders", orders)
         self.execOrder(orders, otherArmy)
@@ -232,6 +591,13 @@ class Army:
         #print("executer")
 
 
+    def previous_targets(self):
+        """Last turn's (unit, target) orders that can still be carried out."""
+        targets = self._last_targets
+        if isinstance(targets, dict):
+            targets = targets.items()
+        return [(unit, target) for unit, target in targets if self.is_living(unit) and target.is_alive()]
+
     def test_collision(self,vector,unit, object):
         """
         rect = (x, y, largeur, hauteur)
@@ -272,4 +638,8 @@ class Army:
         }
 
 
-"""
\ No newline at end of file
+"""
+
+
+def _distance_sq(p1, p2):
+    return (p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2
@@ -0,0 +1,12 @@
+class Event:
+    """Something notable that happened during a tick (e.g. an elephant trample), kept for frontends and stats."""
+
+    def __init__(self, kind, unit, targets=None, tick=None):
+
+        self.kind: str = kind          # "trample" | ...
+        self.unit: object = unit       # unité à l'origine de l'évènement
+        self.targets: list = targets if targets is not None else []
+        self.tick = tick
+
+    def __repr__(self):
+        return f"({self.unit},'{self.kind}',{self.targets})"
@@ -12,37 +12,40 @@ class CaptainBraindead(General):
 
     def getTargets(self, map: Map, otherArmy: Army):
         targets = []
-        enemy_units = otherArmy.living_units()
+        view = self.view(otherArmy)
+        enemy_units = view.enemies
         if not enemy_units: #this is to prevent errors when there are no enemy units alive
             return targets
 
-        for unit in self.army.living_units():
+        # les unités endormies n'avaient aucun ennemi en vue : l'armée les réveille si cela change
+        for unit in self.army.active_units():
+            if not view.decides(unit):
+                continue
 
             last_attacker = getattr(unit, "last_attacker", None)
-            if last_attacker in enemy_units:
+            if otherArmy.is_living(last_attacker):
                 targets.append((unit, last_attacker))
             else :
 
             # no recent attacker: engage closest enemy in line of sight (simplified to nearest distance)
-                target = min(
-                    enemy_units,
-                    key=lambda enemy: self.__distance_sq(unit, enemy),
-                    default=None,
-                )
+                target = view.nearest_enemy(unit)
                 if target is not None:
                     if not isinstance(unit, Monk):
                         if self.__distance_sq(unit, target) < unit.line_of_sight ** 2:
                             targets.append((unit, target))
+                        else:
+                            self.army.sleep(unit)
                     else :
                         if unit.cooldown > 0 :
-                            allies = [a for a in self.army.living_units() if a.hp < a.max_hp and a != unit]
-                            if allies :
-                                target = min(allies, key=lambda allie: self.__distance_sq(unit, allie))
+                            target = view.nearest_wounded(unit, exclude={unit})
+                            if target is not None :
                                 if self.__distance_sq(unit, target) < unit.line_of_sight ** 2:
                                     targets.append((unit, target))
                         else :
                             if self.__distance_sq(unit, target) < unit.line_of_sight ** 2:
                                 targets.append((unit, target))
+                            else:
+                                self.army.sleep(unit)
         return targets
 
     #this function computes the squared distance between two units
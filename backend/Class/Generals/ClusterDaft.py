@@ -0,0 +1,13 @@
+from backend.Class.Generals.ClusterTargeting import ClusterTargeting
+from backend.Class.Generals.MajorDaft import MajorDaft
+
+
+class ClusterDaft(ClusterTargeting, MajorDaft):
+    """
+    MajorDaft deciding by groups: every unit still rushes the closest enemy, but
+    "closest" is searched inside the enemy cluster matched with its own cluster.
+    """
+
+    @property
+    def name(self):
+        return "ClusterDaft"
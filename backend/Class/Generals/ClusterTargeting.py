@@ -0,0 +1,26 @@
+from backend.Utils.clusters import ClusterTargets
+from backend.Utils.snapshot import BattleSnapshot
+
+
+class ClusterTargeting:
+    """
+    Mixin for big battles: put it before a general in the bases
+    (class ClusterDaft(ClusterTargeting, MajorDaft)) and the general's plain
+    "closest enemy" queries are answered by group: allies and enemies are binned
+    in cells of `cluster_cell`, each allied cluster is matched with the closest
+    enemy cluster, and a unit only picks among that cluster's members.
+    The general's own rules (monks, type preferences, ...) are left untouched.
+    """
+    cluster_cell = 4.0
+
+    def decide(self, map, otherArmy):
+        owned = self.snapshot is None
+        if owned:
+            self.snapshot = BattleSnapshot(self.army, otherArmy)
+        view = self.snapshot
+        view.clusters = ClusterTargets(view.allies, view.enemies, self.cluster_cell)
+        try:
+            return super().decide(map, otherArmy)
+        finally:
+            if owned:
+                self.snapshot = None
@@ -6,30 +6,86 @@ from backend.Class.Units.Knight import Knight
 from backend.Class.Units.Monk import Monk
 from backend.Class.Units.Pikeman import Pikeman
 from backend.Class.Units.Unit import Unit
+from backend.Utils.nearest import NearestIndex
 
 
 class ColonelArchBtw(General) :
+    # le choix des arbalétriers qui chassent les moines est global : refait tous les 5 tours,
+    # ou dès qu'un moine chassé / un chasseur tombe (voir replan_needed)
+    plan_every = 5
+
+    def __init__(self):
+        super().__init__()
+        self._hunters = {}      # arbalétrier -> moine ennemi qu'il chasse
+        self._crowded = None    # plus de 40 ennemis au moment du plan
+        self._enemy_monks = 0
+
+    def plan(self, map, otherArmy):
+        view = self.view(otherArmy)
+        monks = view.enemies_of(Monk)
+        self._crowded = len(view.enemies) > 40
+        self._enemy_monks = len(monks)
+        self._hunters = {}
+        if self._crowded or not monks:
+            return
+        # avec les cartes d'influence, on chasse de préférence les moines là où nos dégâts dominent les leurs
+        reachable = self._reachable_monks(view, monks)
+        monk_index = NearestIndex(reachable) if reachable else None
+        # les deux arbalétriers les plus proches du moine ennemi le plus proche s'en chargent
+        for unit in view.allies_of(Crossbowman):
+            if monk_index is not None:
+                proxy_monk = monk_index.nearest(unit.position)
+            else:
+                proxy_monk = view.nearest_enemy(unit, Monk)
+            proxy_cross = view.nearest_ally(proxy_monk, Crossbowman)
+            second_cross = view.nearest_ally(proxy_monk, Crossbowman, exclude={proxy_cross})
+            if unit == proxy_cross or unit == second_cross:
+                self._hunters[unit] = proxy_monk
+
+    @staticmethod
+    def _reachable_monks(view, monks):
+        """Enemy monks standing where our damage potential is at least theirs, None without influence maps."""
+        own, enemy = view.influence, view.enemy_influence
+        if own is None or enemy is None:
+            return None
+        reachable = [m for m in monks if m.position is not None
+                     and own.at("damage", *m.position) >= enemy.at("damage", *m.position)]
+        # aucun moine atteignable : on garde la chasse habituelle (le plus proche)
+        return reachable or None
+
+    def replan_needed(self, map, otherArmy):
+        # compteurs tenus à jour par les partitions par type de l'armée : pas de parcours
+        if (otherArmy.alive_count() > 40) != self._crowded or otherArmy.count_of(Monk) != self._enemy_monks:
+            return True
+        for unit, monk in self._hunters.items():
+            if not otherArmy.is_living(monk) or not self.army.is_living(unit):
+                return True
+        return False
+
     def getTargets(self, map, otherArmy):
         deja_pris= set()
         targets=[]
-        enemy_units = otherArmy.living_units()
-        for unit in self.army.living_units() :
+        # listes par type, blessés et index de plus proche voisin calculés une fois par tour dans la vue partagée
+        view = self.view(otherArmy)
+        enemy_units = view.enemies
+        for unit in view.allies :
+            if not view.decides(unit):
+                continue
             target = None
             #if unit.last_attacked and unit.last_attacked.is_alive() :
             #    targets.append((unit, unit.last_attacked))
             #else :
-            if len(otherArmy.living_units()) > 40 :
+            if len(enemy_units) > 40 :
                 if unit.position is None:
                     continue
-                target = min(otherArmy.living_units(), key=lambda enemy: self.__distance_sq(unit, enemy))
+                target = view.nearest_enemy(unit)
                 if target is not None:
                     if not isinstance(unit, Monk):
                         targets.append((unit, target))
                     else:
                         if unit.cooldown > 0:
-                            allies = [a for a in self.army.living_units() if a.hp < a.max_hp and a != unit]
-                            if allies:
-                                target = min(allies, key=lambda allie: self.__distance_sq(unit, allie))
+                            target = view.nearest_wounded(unit, exclude={unit})
+                            if target is not None:
                                 targets.append((unit, target))
                         else:
                             targets.append((unit, target))
@@ -37,57 +93,43 @@ class ColonelArchBtw(General) :
             else:
                 if not isinstance(unit, Monk):
                     if isinstance(unit, Crossbowman):
-                        pikemans = [e for e in enemy_units if isinstance(e, Pikeman) and e not in deja_pris]
-                        target = self.enemy_in_range(unit, pikemans)
-                        monks = [e for e in enemy_units if isinstance(e, Monk)]
-                        if monks:
-                            my_cross = [e for e in self.army.living_units() if isinstance(e, Crossbowman)]
-                            proxy_monk = self.enemy_in_range(unit, monks)
-                            proxy_cross = self.enemy_in_range(proxy_monk, my_cross)
-                            my_cross.remove(proxy_cross)
-                            second_cross = self.enemy_in_range(proxy_monk, my_cross)
-                            if unit == proxy_cross or unit == second_cross:
-                                target = proxy_monk
+                        target = view.nearest_enemy(unit, Pikeman, exclude=deja_pris)
+                        # chasseur de moine désigné par le dernier plan
+                        proxy_monk = self._hunters.get(unit)
+                        if proxy_monk is not None and otherArmy.is_living(proxy_monk):
+                            target = proxy_monk
 
                     elif isinstance(unit, Pikeman):
                         # elephants = [e for e in enemy_units if isinstance(e, Elephant)]
                         # if elephants :
                         #    target = self.enemy_in_range(unit, elephants)
                         # else :
-                        knights = [e for e in enemy_units if isinstance(e, Knight)]
-                        target = self.enemy_in_range(unit, knights)
+                        target = view.nearest_enemy(unit, Knight)
                     elif isinstance(unit, Knight):
                         # my_cross = [e for e in self.army.living_units() if isinstance(e, Crossbowman)]
                         # if self.enemy_in_range(unit, my_cross, 5):
                         #    crossbowmans = [e for e in enemy_units if isinstance(e, Crossbowman)]
                         #    target = self.enemy_in_range(unit, crossbowmans)
                         # else:
-                        target = self.enemy_in_range(unit, enemy_units)
+                        target = view.nearest_enemy(unit)
                         if isinstance(unit.last_attacker, Pikeman):
-                            crossbowmans = [e for e in enemy_units if isinstance(e, Crossbowman)]
-                            target = self.enemy_in_range(unit, crossbowmans)
+                            target = view.nearest_enemy(unit, Crossbowman)
                     elif isinstance(unit, Elephant):
-                        my_cross = [e for e in self.army.living_units() if isinstance(e, Crossbowman)]
-                        if self.enemy_in_range(unit, my_cross, 3):
-                            crossbowmans = [e for e in enemy_units if isinstance(e, Crossbowman)]
-                            target = self.enemy_in_range(unit, crossbowmans)
+                        if view.nearest_ally(unit, Crossbowman, 3 ** 2):
+                            target = view.nearest_enemy(unit, Crossbowman)
                         else:
-                            target = self.enemy_in_range(unit, enemy_units)
+                            target = view.nearest_enemy(unit)
 
                     if target is not None:
                         targets.append((unit, target))
                     else:
 
                         last_attacker = getattr(unit, "last_attacker", None)
-                        if last_attacker in enemy_units:
+                        if otherArmy.is_living(last_attacker):
                             targets.append((unit, last_attacker))
                         else:
 
-                            target = min(
-                                enemy_units,
-                                key=lambda enemy: self.__distance_sq(unit, enemy),
-                                default=None,
-                            )
+                            target = view.nearest_enemy(unit)
                             if target is not None:
                                 targets.append((unit, target))
 
@@ -95,34 +137,29 @@ class ColonelArchBtw(General) :
                     if unit.cooldown > 40 and unit.last_attacked is not None:
 
                         if unit.last_attacked is "conversion":
-                            unit.last_attacked = max(self.army.living_units(),
+                            unit.last_attacked = max(view.allies,
                                                      key=lambda allie: self.__distance_sq(unit, allie))
                         target = unit.last_attacked
 
-                        monks = [e for e in enemy_units if isinstance(e, Monk)]
-                        if monks:
-                            target = self.enemy_in_range(unit, monks)
+                        if otherArmy.count_of(Monk):
+                            target = view.nearest_enemy(unit, Monk)
 
 
                     elif unit.cooldown > 0:  # partie heal
-                        target = None
-                        allies = [a for a in self.army.living_units() if a.hp < a.max_hp - unit.attack and a != unit]
-                        if allies:
-                            monks = [m for m in allies if isinstance(m, Monk)]
-                            if monks: target = self.enemy_in_range(unit, monks, 9)
-                            if not target: target = self.enemy_in_range(unit, allies)
+                        # blessés à qui il manque plus qu'un soin, les moines d'abord s'ils sont à moins de 9 cases
+                        target = view.nearest_wounded(unit, Monk, unit.attack, 9 ** 2, exclude={unit})
+                        if not target:
+                            target = view.nearest_wounded(unit, None, unit.attack, exclude={unit})
                     else:  # partie conversion
-                        elephants = [e for e in enemy_units if isinstance(e, Elephant)]
-                        if elephants:
-                            target = self.enemy_in_range(unit, elephants)
+                        if otherArmy.count_of(Elephant):
+                            target = view.nearest_enemy(unit, Elephant)
                         else:
-                            monks = [e for e in enemy_units if isinstance(e, Monk)]
-                            if monks:
-                                target = self.enemy_in_range(unit, monks)
+                            if otherArmy.count_of(Monk):
+                                target = view.nearest_enemy(unit, Monk)
 
 
                         if not target:
-                            target = self.enemy_in_range(unit, enemy_units)
+                            target = view.nearest_enemy(unit)
 
                     if target and isinstance(target, Unit):
                         targets.append((unit, target))
@@ -1,12 +1,36 @@
 # backend/generals.py
+import time
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple
 
+from backend.Utils.combat import COMBAT_TABLE
+from backend.Utils.decision_budget import DecisionTimer
+from backend.Utils.retarget import Retargeter
+from backend.Utils.snapshot import BattleSnapshot
+
 
 class General(ABC):
+    # garder la cible du tour précédent tant qu'elle reste valable (voir backend/Utils/retarget.py)
+    sticky_targets = False
+    retarget_margin = 1.0
+    # cadence de la planification stratégique : plan() tourne tous les `plan_every` tours de l'armée
+    # (ou plus tôt si replan_needed() le demande), getTargets n'exécute que le plan en cache.
+    # 0 = pas de plan séparé, tout est décidé dans getTargets à chaque tour
+    plan_every = 0
 
     def __init__(self):
         self.army = None
+        # table par couple de types partagée avec Army : dégâts réels et portée d'engagement au carré
+        self.combat = COMBAT_TABLE
+        # vue du champ de bataille posée par Army.fight pendant getTargets
+        self.snapshot = None
+        self.retargeter = None
+        # temps passé dans plan() et nombre de plans depuis le début de la bataille
+        self.plan_time = 0.0
+        self.plan_count = 0
+        self._planned_at = None  # army.clock du dernier plan
+        # durée de chaque decide(), mesurée par Army.fight
+        self.timer = DecisionTimer()
 
     @abstractmethod
     def getTargets(self, map, otherArmy):
@@ -14,3 +38,55 @@ class General(ABC):
         # qu'assigner une unité alliée à une unité ennemie selon des critères propres
         pass
 
+    def view(self, otherArmy) -> BattleSnapshot:
+        """Snapshot of this turn (built by Army.fight), or a fresh one when called outside a fight."""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.enemy_army is not otherArmy:
+            snapshot = BattleSnapshot(self.army, otherArmy)
+        return snapshot
+
+    def plan(self, map, otherArmy):
+        """Slow strategic step, run every `plan_every` turns; keep its result on the general for getTargets."""
+        pass
+
+    def replan_needed(self, map, otherArmy) -> bool:
+        """Trigger checked on the turns between two plans: True re-plans right away."""
+        return False
+
+    def _maybe_plan(self, map, otherArmy):
+        if not self.plan_every:
+            return
+        clock = self.army.clock
+        if (self._planned_at is None or clock - self._planned_at >= self.plan_every
+                or self.replan_needed(map, otherArmy)):
+            start = time.perf_counter()
+            self.plan(map, otherArmy)
+            self.plan_time += time.perf_counter() - start
+            self.plan_count += 1
+            self._planned_at = clock
+
+    def decide(self, map, otherArmy):
+        """plan() when it is due, then getTargets (through the sticky-target layer when the general opted in)."""
+        self._maybe_plan(map, otherArmy)
+        if not self.sticky_targets:
+            return self.getTargets(map, otherArmy)
+        if self.retargeter is None:
+            self.retargeter = Retargeter(self.retarget_margin)
+        return self.retargeter.targets(self, map, otherArmy)
+
+    def squad(self, name, units=()):
+        """Squad `name` of this general's army (see Army.create_squad): one order for the whole group."""
+        return self.army.create_squad(name, units)
+
+    def damage_to(self, unit, target) -> int:
+        """Damage one hit of `unit` deals to `target`, as applied by Army.execOrder."""
+        return self.combat.damage(unit, target)
+
+    def can_engage(self, unit, target) -> bool:
+        """True if `target` is close enough for `unit` to attack / heal / convert it this tick."""
+        if unit.position is None or target.position is None:
+            return False
+        dx = target.position[0] - unit.position[0]
+        dy = target.position[1] - unit.position[1]
+        return dx * dx + dy * dy <= self.combat.engage_r2(unit, target)
+
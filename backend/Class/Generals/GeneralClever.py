@@ -1,7 +1,20 @@
 from backend.Class.Generals.General import General
 from backend.Class.Units.Monk import Monk
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# En dessous de ce nombre de couples (unité, ennemi), ma boucle Python va plus vite que NumPy
+VECTOR_MIN_PAIRS = 256
+# Taille max d'un bloc de la matrice des scores, pour ne pas exploser la mémoire sur les très grosses batailles
+SCORE_CHUNK_CELLS = 1 << 18
+
 class GeneralClever(General):
+    # Je vérifie le déploiement à chaque tour : une fois déployée, le plan ne coûte plus rien
+    plan_every = 1
+
     def __init__(self):
         super().__init__()
         # Petite base de données perso pour connaître les PV max des unités et calculer mes ratios
@@ -11,11 +24,26 @@ class GeneralClever(General):
         # Ma distance de sécurité : si l'ennemi approche à moins de 7 cases, on engage !
         self._deployment_threshold = 49 
 
+    def plan(self, map, otherArmy):
+        # Ma surveillance du déploiement, faite dans le plan (cadence réglable avec plan_every)
+        if self._is_deployed:
+            return  # c'est verrouillé, plus rien à surveiller
+        view = self.view(otherArmy)
+        if not view.enemies or not view.allies:
+            return
+        # TACTIQUE : Si l'ennemi n'a presque plus personne, je passe en mode "assaut total" pour finir la partie
+        if len(view.enemies) <= 2:
+            self._is_deployed = True
+        # Je surveille la distance entre les deux armées
+        elif self._enemy_within(view, self._deployment_threshold):
+            self._is_deployed = True
+
     def getTargets(self, map, otherArmy):
         try:
-            # Je récupère les troupes encore en vie des deux côtés
-            enemies = otherArmy.living_units()
-            my_units = self.army.living_units()
+            # Je récupère les troupes encore en vie des deux côtés (vue du tour partagée par le moteur)
+            view = self.view(otherArmy)
+            enemies = view.enemies
+            my_units = view.allies
         except:
             # Sécurité au cas où le code de mes camarades ferait des siennes
             return []
@@ -23,27 +51,21 @@ class GeneralClever(General):
         if not enemies or not my_units:
             return []
 
-        # TACTIQUE : Si l'ennemi n'a presque plus personne, je passe en mode "assaut total" pour finir la partie
-        if len(enemies) <= 2:
-            self._is_deployed = True
-
-        # Je surveille la distance entre les deux armées
-        min_dist = self._min_distance(my_units, enemies)
-        if not self._is_deployed and min_dist <= self._deployment_threshold:
-            self._is_deployed = True
+        # (le déploiement est décidé dans plan(), juste avant)
+        close_call = None  # un ennemi à moins de 4 cases ? calculé seulement si un archer en a besoin
 
         targets = []
+        to_score = []  # unités qui passent par le scoring, traitées toutes ensemble à la fin
         for unit in my_units:
-            if not hasattr(unit, 'position') or unit.position is None:
+            if not hasattr(unit, 'position') or unit.position is None or not view.decides(unit):
                 continue
 
             # --- MA LOGIQUE POUR LE MOINE ---
             if isinstance(unit, Monk):
                 # Le moine check d'abord s'il y a des copains blessés à soigner
-                allies = [a for a in self.army.living_units() if a.hp < getattr(a, 'max_hp', 100)]
-                if allies:
-                    # Il choisit le blessé le plus proche pour être efficace
-                    target = min(allies, key=lambda a: self.__distance_sq(unit, a))
+                if view.wounded_allies:
+                    # Il choisit le blessé le plus proche pour être efficace (index des blessés de l'armée)
+                    target = view.nearest_wounded(unit)
                     targets.append((unit, target))
                     continue # S'il soigne, il ne fait rien d'autre ce tour-ci
                 
@@ -55,16 +77,60 @@ class GeneralClever(General):
             is_ranged = getattr(unit, 'range', 1) > 1
             if not self._is_deployed and is_ranged:
                 # Sauf si un ennemi me colle déjà (moins de 4 cases), là je me défends !
-                if min_dist > 16: 
+                if close_call is None:
+                    close_call = self._enemy_within(view, 16)
+                if not close_call:
                     continue
 
             # --- MON ALGORITHME DE SCORING ---
-            # Je demande à mon cerveau tactique de choisir la meilleure cible possible
-            target = self._choose_best_target(unit, enemies)
-            if target:
-                targets.append((unit, target))
+            # Je réserve la place de l'unité (l'ordre des ordres compte) et je score tout le monde d'un coup
+            targets.append((unit, None))
+            to_score.append(unit)
+
+        # Je demande à mon cerveau tactique de choisir la meilleure cible possible
+        best = iter(self._best_targets(to_score, view))
+        result = []
+        for unit, target in targets:
+            if target is None:
+                target = next(best)
+                if not target:
+                    continue
+            result.append((unit, target))
+        return result
 
-        return targets
+    def _best_targets(self, units, view):
+        """Meilleure cible de chaque unité (ou None), avec la matrice des scores quand NumPy est là."""
+        enemies = view.enemies
+        if np is None or len(units) * len(enemies) < VECTOR_MIN_PAIRS:
+            return [self._choose_best_target(unit, enemies) for unit in units]
+
+        # Tout ce qui ne dépend que de l'ennemi est calculé une seule fois
+        enemy_xy = view.enemy_xy
+        placed = ~np.isnan(enemy_xy[:, 0])
+        enemy_kind = np.fromiter((self.combat.index_of(e) for e in enemies), dtype=np.intp, count=len(enemies))
+        m_hp = np.fromiter((self._max_hp_cache.get(e.__class__.__name__, 100) for e in enemies),
+                           dtype=np.float64, count=len(enemies))
+        hp_ratio = np.where(m_hp > 0, np.asarray(view.enemy_hp, dtype=np.float64) / np.where(m_hp > 0, m_hp, 1), 1)
+        focus = np.where(hp_ratio < 0.3, 3.0, np.where(hp_ratio < 0.6, 1.5, 1.0))
+
+        unit_kind = np.fromiter((self.combat.index_of(u) for u in units), dtype=np.intp, count=len(units))
+        unit_xy = np.array([u.position for u in units], dtype=np.float64)
+        damage = self.combat.damage_array
+
+        best = []
+        rows = max(1, SCORE_CHUNK_CELLS // len(enemies))
+        for start in range(0, len(units), rows):
+            stop = start + rows
+            dmg = np.maximum(1, damage[unit_kind[start:stop, None], enemy_kind[None, :]])
+            dx = unit_xy[start:stop, 0, None] - enemy_xy[None, :, 0]
+            dy = unit_xy[start:stop, 1, None] - enemy_xy[None, :, 1]
+            # même formule que _choose_best_target : (dégâts * focus) / (distance² + 0.5)
+            score = (dmg * focus) / (dx ** 2 + dy ** 2 + 0.5)
+            score[:, ~placed] = -np.inf
+            choice = score.argmax(axis=1)  # le premier maximum, comme ma boucle
+            found = score[np.arange(len(choice)), choice] > -np.inf
+            best.extend(enemies[j] if ok else None for j, ok in zip(choice.tolist(), found.tolist()))
+        return best
 
     def _choose_best_target(self, unit, enemies):
         best_enemy = None
@@ -74,14 +140,8 @@ class GeneralClever(General):
             if not hasattr(enemy, 'position') or enemy.position is None:
                 continue
             
-            # Je calcule mes dégâts réels en comptant mes bonus et son armure
-            bonus = 0
-            try:
-                bonus = unit.compute_bonus(enemy)
-            except:
-                pass
-            
-            dmg = max(1, (getattr(unit, 'attack', 1) + bonus) - getattr(enemy, 'armor', 0))
+            # Je calcule mes dégâts réels en comptant mes bonus et son armure (table partagée avec le moteur)
+            dmg = max(1, self.damage_to(unit, enemy))
             dist_sq = self.__distance_sq(unit, enemy)
             
             # MA STRATÉGIE "FOCUS FIRE" : On achève les unités mourantes !
@@ -101,16 +161,30 @@ class GeneralClever(General):
         
         return best_enemy
 
-    def _min_distance(self, units, enemies):
-        """Petite fonction pour trouver l'ennemi le plus proche de mon bloc d'armée."""
-        best = float("inf")
-        for u in units:
-            if not hasattr(u, 'position') or u.position is None: continue
-            for e in enemies:
-                if not hasattr(e, 'position') or e.position is None: continue
-                d = self.__distance_sq(u, e)
-                if d < best: best = d
-        return best
+    def _enemy_within(self, view, limit_sq):
+        """Est-ce qu'un de mes soldats a un ennemi à distance² <= limit_sq ?"""
+        allies = [u for u in view.allies if getattr(u, 'position', None) is not None]
+        enemies = [e for e in view.enemies if getattr(e, 'position', None) is not None]
+        if not allies or not enemies:
+            return False
+
+        # Sortie rapide : si les boîtes englobantes des deux armées sont trop loin, personne n'est proche
+        gap_x = max(0, min(e.position[0] for e in enemies) - max(u.position[0] for u in allies),
+                    min(u.position[0] for u in allies) - max(e.position[0] for e in enemies))
+        gap_y = max(0, min(e.position[1] for e in enemies) - max(u.position[1] for u in allies),
+                    min(u.position[1] for u in allies) - max(e.position[1] for e in enemies))
+        gap = gap_x ** 2 + gap_y ** 2
+        if gap > limit_sq:
+            return False
+
+        # Sinon l'index de la vue me donne l'ennemi le plus proche de chaque unité, et je m'arrête au premier trouvé
+        for u in allies:
+            e = view.nearest_enemy(u)
+            if e is None or e.position is None: continue
+            d = self.__distance_sq(u, e)
+            if d <= limit_sq:
+                return True
+        return False
 
     @staticmethod
     def __distance_sq(u1, u2):
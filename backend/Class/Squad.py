@@ -0,0 +1,69 @@
+class SquadOrder:
+    """Order shared by every unit of a squad, expanded into per-unit targets / moves by Army.fight."""
+
+    def __init__(self, kind, target=None, position=None, radius=0.0):
+
+        self.kind: str = kind          # "attack" | "hold" | "follow"
+        self.target = target           # unité ennemie (attack) ou Squad suivie (follow)
+        self.position = position       # centre de la zone tenue (hold)
+        self.radius: float = radius    # rayon de la zone (hold) ou distance de suivi (follow)
+
+    def __repr__(self):
+        return f"('{self.kind}',{self.target if self.target is not None else self.position})"
+
+
+class Squad:
+    """
+    Persistent group of units of one army. Army keeps the membership up to date:
+    dead and converted units leave their squad on their own.
+    A general gives one order to the squad instead of one target per unit;
+    units of a squad without order are left to the general's getTargets.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.army = None
+        self._members = {}  # dict = ensemble ordonné
+        self.order = None
+
+    # --- membres ----------------------------------------------------------------
+    @property
+    def units(self):
+        return list(self._members)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __iter__(self):
+        return iter(list(self._members))
+
+    def __contains__(self, unit):
+        return unit in self._members
+
+    def is_empty(self):
+        return not self._members
+
+    def centroid(self):
+        placed = [u.position for u in self._members if u.position is not None]
+        if not placed:
+            return None
+        return (sum(p[0] for p in placed) / len(placed), sum(p[1] for p in placed) / len(placed))
+
+    # --- ordres -----------------------------------------------------------------
+    def attack(self, target):
+        """Every member goes for `target` until it dies or changes side."""
+        self.order = SquadOrder("attack", target=target)
+
+    def hold(self, position, radius: float = 3.0):
+        """Stay within `radius` of `position` and fight the enemies that come into that area."""
+        self.order = SquadOrder("hold", position=tuple(position), radius=radius)
+
+    def follow(self, squad, distance: float = 2.0):
+        """Stay within `distance` of the centroid of `squad` (of the same army)."""
+        self.order = SquadOrder("follow", target=squad, radius=distance)
+
+    def clear_order(self):
+        self.order = None
+
+    def __repr__(self):
+        return f"Squad({self.name!r}, {len(self)} units, {self.order})"
@@ -1,10 +1,14 @@
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Castle(Unit):
+    __slots__ = ()
+    prototype = UnitType("Castle", max_hp=4800, attack=55, armor=9,
+                         speed=0, range=8, reload_time=2, line_of_sight=11, size=5, classes=["Castle"], bonuses={})
+
     def __init__(self, position: tuple[float]):
-        super().__init__(4800, attack=55, armor=9,
-                         speed=0, range_=8, reload_time=2, ligne_of_sight=11,position=position,size=5, classes=["Castle"], bonuses={})
+        super().__init__(position)
 
     def unit_type(self) -> str:
         return "Castle"
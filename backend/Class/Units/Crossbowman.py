@@ -1,14 +1,16 @@
 from random import randint
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Crossbowman(Unit):
-    def __init__(self, position: tuple[float]):
-        # longer range, slower reload, decent attack
-        super().__init__(35, attack=6, armor=0,
-                         speed=1, range_=5, reload_time=2, ligne_of_sight=7,position=position, classes=["Archer"], bonuses={"Spear": 3, "Building": 0},)
+    __slots__ = ()
+    # longer range, slower reload, decent attack
+    prototype = UnitType("Crossbowman", max_hp=35, attack=6, armor=0,
+                         speed=1, range=5, reload_time=2, line_of_sight=7, classes=["Archer"], bonuses={"Spear": 3, "Building": 0})
 
-        self.army = None
+    def __init__(self, position: tuple[float]):
+        super().__init__(position)
 
 
     def unit_type(self) -> str:
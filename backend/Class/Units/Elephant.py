@@ -1,10 +1,14 @@
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Elephant(Unit):
+    __slots__ = ()
+    prototype = UnitType("Elephant", max_hp=300, attack=14, armor=2,
+                         speed=1, range=1, reload_time=2, line_of_sight=8, size=2, classes=["Cavalry"], bonuses={"Castle": 7})
+
     def __init__(self, position: tuple[float]):
-        super().__init__(300, attack=14, armor=2,
-                         speed=1, range_=1, reload_time=2, ligne_of_sight=8,position=position,size=2, classes=["Cavalry"], bonuses={"Castle": 7})
+        super().__init__(position)
 
     def unit_type(self) -> str:
-        return "Elephant"
\ No newline at end of file
+        return "Elephant"
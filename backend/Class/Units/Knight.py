@@ -1,10 +1,14 @@
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Knight(Unit):
+    __slots__ = ()
+    prototype = UnitType("Knight", max_hp=100, attack=10, armor=2,
+                         speed=2, range=1, reload_time=2, line_of_sight=4, classes=["Cavalry"], bonuses={"Infantry": 2})
+
     def __init__(self, position: tuple[float]):
-        super().__init__(100, attack=10, armor=2,
-                         speed=2, range_=1, reload_time=2, ligne_of_sight=4,position=position, classes=["Cavalry"], bonuses={"Infantry": 2})
+        super().__init__(position)
 
     def unit_type(self) -> str:
         return "Knight"
@@ -1,12 +1,16 @@
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Monk(Unit):
-    def __init__(self, position: tuple[float]):
-        super().__init__(30, attack=4, armor=0,
-                         speed=1, range_=9, reload_time=62, ligne_of_sight=11,position=position, classes=[], bonuses={})
+    __slots__ = ()
+    prototype = UnitType("Monk", max_hp=30, attack=4, armor=0,
+                         speed=1, range=9, reload_time=62, line_of_sight=11, classes=[], bonuses={})
+
+    convert_range = 0
 
-        self.convert_range = 0
+    def __init__(self, position: tuple[float]):
+        super().__init__(position)
 
     def unit_type(self) -> str:
         return "Monk"
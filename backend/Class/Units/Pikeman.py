@@ -1,13 +1,14 @@
 from backend.Class.Units.Unit import Unit
+from backend.Class.Units.UnitType import UnitType
 
 
 class Pikeman(Unit):
-
+    __slots__ = ()
+    prototype = UnitType("Pikeman", max_hp=55, attack=4, armor=0,
+                         speed=1, range=1, reload_time=3, line_of_sight=6, classes=["Infantry", "Spear"], bonuses={"Cavalry": 10})
 
     def __init__(self, position: tuple[float]):
-        super().__init__(55, attack=4, armor=0,
-                         speed=1, range_=1, reload_time=3,ligne_of_sight=6, position=position, classes=["Infantry", "Spear"], bonuses={"Cavalry": 10})
+        super().__init__(position)
 
     def unit_type(self) -> str:
         return "Pikeman"
-
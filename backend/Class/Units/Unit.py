@@ -1,31 +1,47 @@
-import uuid
+import itertools
 from abc import abstractmethod
 
+from backend.Class.Units.UnitType import UnitType
 
-class Unit():
-
-
-    def __init__(self, max_hp: int, attack: int, armor: int,
-                 speed: int, range_: int, reload_time: int, ligne_of_sight:int,position: tuple[float]= None, size :float=1, classes=None, bonuses=None):
+# identifiants compacts ; la bataille renumérote ses unités avec son propre compteur (Battle.assign_unit_ids)
+_unit_ids = itertools.count(1)
 
 
-        self.__id = str(uuid.uuid4())
+class Unit():
+    # Les caractéristiques (PV max, attaque, portée, classes, bonus, ...) sont partagées par type via
+    # `prototype` et exposées comme attributs de classe ; l'instance ne garde que l'état qui change.
+    __slots__ = ("__id", "army", "_store", "_row", "_hp", "_position", "_ready_at",
+                 "last_attacker", "last_attacked")
+
+    prototype: UnitType = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        prototype = cls.__dict__.get("prototype")
+        if prototype is not None:
+            cls.max_hp = prototype.max_hp
+            cls._attack = prototype.attack
+            cls.armor = prototype.armor
+            cls.speed = prototype.speed
+            cls.range = prototype.range
+            cls.reload_time = prototype.reload_time
+            cls.line_of_sight = prototype.line_of_sight
+            cls.size = prototype.size
+            cls.classes = prototype.classes
+            cls.bonuses = prototype.bonuses
+
+    def __init__(self, position: tuple[float] = None):
+        self.__id = next(_unit_ids)
         self.army = None
+        # ligne dans le UnitStore de la bataille quand il est activé (voir backend/Utils/unit_store.py)
+        self._store = None
+        self._row = -1
 
-        # caractéristique
-        self.max_hp = max_hp
-        self.hp = max_hp
-        self._attack = attack
-        self.armor = armor
-        self.speed = speed
-        self.range = range_
-        self.position = position  # (x, y) or None
-        self.size = size
-        self.classes = classes if classes else []
-        self.bonuses = bonuses if bonuses else {}
-        self.reload_time = reload_time #le temps qu'il faut entre 2 attaques
-        self.cooldown = 0 #le temps necessaire qu'il reste à attendre pour la prochaine attaque
-        self.line_of_sight = ligne_of_sight
+        self._hp = self.max_hp
+        self._position = position  # (x, y) or None
+        # tick de l'horloge de l'armée à partir duquel l'unité peut de nouveau attaquer
+        # (cooldown = temps qu'il reste à attendre, calculé à la lecture : plus de décompte à chaque tick)
+        self._ready_at = 0
 
         self.last_attacker = None
         self.last_attacked =None
@@ -34,13 +50,76 @@ class Unit():
     def attack(self):
         return self._attack
 
+    @property
+    def hp(self):
+        if self._store is not None:
+            return self._store.get_hp(self._row)
+        return self._hp
+
+    @hp.setter
+    def hp(self, value):
+        # on previent l'armée quand l'unité meurt (ou revit) ou change de PV pour qu'elle tienne ses listes à jour
+        was_alive = self.is_alive()
+        if self._store is not None:
+            self._store.set_hp(self._row, value)
+        else:
+            self._hp = value
+        army = self.army
+        if army is not None:
+            if was_alive != (value > 0):
+                army.on_life_change(self)
+            elif was_alive:
+                army.on_hp_change(self)
+
+    @property
+    def position(self):
+        if self._store is not None:
+            return self._store.get_position(self._row)
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        if self._store is not None:
+            self._store.set_position(self._row, value)
+        else:
+            self._position = value
+
+    @property
+    def ready_at(self):
+        if self._store is not None:
+            return self._store.get_ready_at(self._row)
+        return self._ready_at
+
+    @ready_at.setter
+    def ready_at(self, value):
+        if self._store is not None:
+            self._store.set_ready_at(self._row, value)
+        else:
+            self._ready_at = value
+
+    @property
+    def cooldown(self):
+        army = self.army
+        remaining = self.ready_at - (army.clock if army is not None else 0)
+        return remaining if remaining > 0 else 0
+
+    @cooldown.setter
+    def cooldown(self, value):
+        army = self.army
+        self.ready_at = value + (army.clock if army is not None else 0)
+
 
     @property #id est un argument privé cela permet de créer un getter
     def id(self) :
         return self.__id
 
+    def set_id(self, value):
+        self.__id = value
+
     def is_alive(self) -> bool:
-        return self.hp > 0
+        if self._store is not None:
+            return self._store.get_hp(self._row) > 0
+        return self._hp > 0
 
 
 """
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+
+@dataclass(frozen=True)
+class UnitType:
+    """
+    Immutable stats shared by every unit of one type (flyweight).
+    Each Unit subclass declares one `prototype`; its instances only hold mutable state.
+    """
+    name: str
+    max_hp: int
+    attack: int
+    armor: int
+    speed: int
+    range: int
+    reload_time: int  # le temps qu'il faut entre 2 attaques
+    line_of_sight: int
+    size: float = 1
+    classes: tuple = ()
+    bonuses: Mapping[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # listes / dicts passés par les sous-classes -> versions en lecture seule
+        object.__setattr__(self, "classes", tuple(self.classes))
+        object.__setattr__(self, "bonuses", MappingProxyType(dict(self.bonuses)))
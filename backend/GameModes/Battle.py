@@ -1,8 +1,12 @@
+import itertools
 import json
 import os
 from pathlib import Path
 from backend.GameModes.GameMode import GameMode
 from backend.Utils.class_by_name import general_from_name
+from backend.Utils.influence import InfluenceMap
+from backend.Utils.spatial_grid import SpatialGrid
+from backend.Utils.unit_store import UnitStore, numpy_available
 from backend.Class.Units.Knight import Knight
 from backend.Class.Units.Pikeman import Pikeman
 from backend.Class.Units.Crossbowman import Crossbowman
@@ -17,6 +21,26 @@ class Battle(GameMode):
         self.tick_delay = 1.0  # seconds between simulation ticks
         self.frame_delay = 0.05  # sleep duration when not using pygame
         self.verbose = True
+        self.spatial_grid = None  # built at the start of gameLoop, kept up to date by Army.execOrder
+        self.use_unit_store = False  # opt-in NumPy structure-of-arrays storage for unit state
+        self.unit_store = None
+        self._unit_ids = itertools.count(1)  # compteur d'identifiants propre à la bataille
+        self.ticks_per_sec = 0.0  # mesuré par run_headless
+        # Fin anticipée : si aucun PV ne change et rien ne bouge pendant `stalemate_ticks` ticks,
+        # la bataille s'arrête avec le résultat "stalemate" (None = désactivé)
+        self.stalemate_ticks = None
+        self.stalemate = False
+        self._idle_ticks = 0
+        # Budget de temps par décision de général, en secondes (None = pas de limite),
+        # et ce qu'on fait d'une décision en retard : "warn", "fallback" ou "forfeit"
+        # (voir backend/Utils/decision_budget.py)
+        self.decision_budget = None
+        self.budget_mode = "warn"
+        self.forfeited = None  # armée qui a perdu par forfait
+        # Cartes d'influence par armée (dégâts, PV, couverture à distance), recalculées tous les
+        # `influence_every` ticks (None = désactivé, demande numpy ; voir backend/Utils/influence.py)
+        self.influence_every = None
+        self.influence_cell = 2.0
 
     def to_dict(self):
         """Serialize battle state to dictionary for saving."""
@@ -29,7 +53,7 @@ class Battle(GameMode):
                 "hp": unit.hp,
                 "position": list(unit.position) if unit.position else None,
                 "cooldown": unit.cooldown,
-                "army": "army1" if unit in self.army1.units else "army2"
+                "army": "army1" if unit.army is self.army1 else "army2"
             }
         
         # Serialize generals (including AI state)
@@ -103,7 +127,7 @@ class Battle(GameMode):
                 continue
             
             # Restore unit ID (override the auto-generated one)
-            unit._Unit__id = unit_id
+            unit.set_id(unit_id)
             
             # Restore unit state
             unit.hp = unit_data.get("hp", unit.hp)
@@ -158,6 +182,54 @@ class Battle(GameMode):
         if hasattr(general, '_deployment_threshold') and '_deployment_threshold' in state:
             general._deployment_threshold = state['_deployment_threshold']
 
+    def assign_unit_ids(self):
+        """Give every unit of the battle a compact integer id from this battle's counter."""
+        for army in (self.army1, self.army2):
+            for unit in army.units:
+                unit.set_id(next(self._unit_ids))
+
+    def build_spatial_grid(self):
+        """(Re)build the collision grid from the current armies and map obstacles."""
+        if self.spatial_grid is None:
+            self.spatial_grid = SpatialGrid()
+        self.spatial_grid.rebuild((self.army1, self.army2), self.map.obstacles)
+        return self.spatial_grid
+
+    def build_unit_store(self):
+        """Move every unit's state into a NumPy UnitStore (only when use_unit_store is set)."""
+        if self.unit_store is not None:
+            self.unit_store.detach_all()
+            self.unit_store = None
+        if not self.use_unit_store:
+            return None
+        if not numpy_available():
+            print("numpy is not installed; running without the array unit store.")
+            self.use_unit_store = False
+            return None
+        self.unit_store = UnitStore.from_armies((self.army1, self.army2))
+        return self.unit_store
+
+    def build_influence(self):
+        """Give each army an InfluenceMap over the map (only when influence_every is set)."""
+        for army in (self.army1, self.army2):
+            army.influence = None
+        if not self.influence_every:
+            return
+        if not numpy_available():
+            print("numpy is not installed; running without influence maps.")
+            self.influence_every = None
+            return
+        width = getattr(self.map, "width", 100)
+        height = getattr(self.map, "height", 100)
+        for army in (self.army1, self.army2):
+            army.influence = InfluenceMap(width, height, self.influence_cell)
+        self.refresh_influence()
+
+    def refresh_influence(self):
+        for army in (self.army1, self.army2):
+            if army.influence is not None:
+                army.influence.refresh(army.living_units(), self.tick)
+
     def end(self):
         if hasattr(self.affichage, "shutdown"):
             self.affichage.shutdown()
@@ -165,6 +237,92 @@ class Battle(GameMode):
     def launch(self):
         self.affichage.initialiser()
 
+    def prepare(self):
+        """Number the units and build the per-battle indexes before the first tick."""
+        self.assign_unit_ids()
+        self.build_unit_store()
+        self.build_spatial_grid()
+        self.build_influence()
+
+    def step(self):
+        """Run one battle tick: both armies pick their targets and act."""
+        influence = getattr(self.army1, "influence", None)
+        if influence is not None and self.tick - influence.tick >= self.influence_every:
+            self.refresh_influence()
+        self.army1.fight(self.map, otherArmy=self.army2)
+        if self.forfeited is None:
+            self.army2.fight(self.map, otherArmy=self.army1)
+        self.tick += 1
+        self._check_progress()
+
+    def _check_progress(self):
+        if self.army1.progressed or self.army2.progressed:
+            self._idle_ticks = 0
+            return
+        self._idle_ticks += 1
+        if self.stalemate_ticks and self._idle_ticks >= self.stalemate_ticks:
+            self.stalemate = True
+
+    def decision_overrun(self, army, targets):
+        """
+        Called by Army.fight when its general went over decision_budget.
+        Returns the orders to carry out, or None when the army forfeits.
+        """
+        general = army.general
+        if self.budget_mode == "forfeit":
+            self.forfeited = army
+            return None
+        if general.timer.over_budget == 1 and getattr(self, "verbose", True):
+            print(f"{general.__class__.__name__} went over its decision budget at tick {self.tick} "
+                  f"({general.timer.worst * 1000:.1f} ms > {self.decision_budget * 1000:.1f} ms, "
+                  f"mode {self.budget_mode})")
+        if self.budget_mode == "fallback":
+            return army.previous_targets()
+        return targets
+
+    def decision_times(self):
+        """(army1, army2) DecisionTimer of the generals, None for an army without general."""
+        return tuple(getattr(getattr(army, "general", None), "timer", None) for army in (self.army1, self.army2))
+
+    def is_over(self, max_ticks=None):
+        if max_ticks is None:
+            max_ticks = self.max_tick
+        return (
+            self.army1.isEmpty() or
+            self.army2.isEmpty() or
+            self.stalemate or
+            self.forfeited is not None or
+            (max_ticks is not None and self.tick >= max_ticks)
+        )
+
+    def run_headless(self, max_ticks=None):
+        """
+        Fast path for tournaments and experiments: no display, no timers, no save.
+        Runs ticks until one army is empty or max_ticks (default: self.max_tick) is reached
+        and returns {"ticks", "elapsed", "ticks_per_sec", "plan_time"} for this run.
+        """
+        import time
+        if max_ticks is not None:
+            self.max_tick = max_ticks
+        self.prepare()
+        start_tick = self.tick
+        start = time.perf_counter()
+        while not self.is_over():
+            self.step()
+        elapsed = time.perf_counter() - start
+        ticks = self.tick - start_tick
+        self.ticks_per_sec = ticks / elapsed if elapsed > 0 else 0.0
+        return {"ticks": ticks, "elapsed": elapsed, "ticks_per_sec": self.ticks_per_sec,
+                "plan_time": self.planning_time()}
+
+    def planning_time(self):
+        """Seconds both generals spent in General.plan() since the battle started."""
+        total = 0.0
+        for army in (self.army1, self.army2):
+            general = getattr(army, "general", None) if army is not None else None
+            total += getattr(general, "plan_time", 0.0)
+        return total
+
     def gameLoop(self):
         import time
         use_pygame = getattr(self.affichage, "uses_pygame", False)
@@ -179,6 +337,8 @@ class Battle(GameMode):
         if hasattr(self.affichage, 'set_battle_instance'):
             self.affichage.set_battle_instance(self)
         
+        self.prepare()
+
         # Initial display (helps fill buffers for curses/pygame alike)
         self.affichage.afficher(self.map, army1=self.army1, army2=self.army2)
         running = True
@@ -189,11 +349,7 @@ class Battle(GameMode):
 
         while running:
             # Check if battle should continue
-            battle_continues = (
-                not self.army1.isEmpty() and 
-                not self.army2.isEmpty() and 
-                (self.max_tick is None or self.tick < self.max_tick)
-            )
+            battle_continues = not self.is_over()
             paused = False
             if hasattr(self.affichage, "is_paused") and callable(getattr(self.affichage, "is_paused")):
                 try:
@@ -219,15 +375,13 @@ class Battle(GameMode):
                                 self.affichage.unit_previous_positions[unit.id] = unit.position
 
                     # Execute one battle tick
-                    self.army1.fight(self.map, otherArmy=self.army2)
-                    self.army2.fight(self.map, otherArmy=self.army1)
+                    self.step()
                     self.save()
-                    self.tick += 1
                     last_tick_time = current_time
                     
                     if getattr(self, "verbose", True):
-                        army1_count = len(self.army1.living_units())
-                        army2_count = len(self.army2.living_units())
+                        army1_count = self.army1.alive_count()
+                        army2_count = self.army2.alive_count()
                         #print(f"Tick {self.tick}: Army1={army1_count} units, Army2={army2_count} units")
             
             # Update display (this will handle input and events internally)
@@ -259,6 +413,12 @@ class Battle(GameMode):
                         self.army1.gameMode = self
                         self.army2.gameMode = self
                         self.map.gameMode = self
+                        self.stalemate = False
+                        self._idle_ticks = 0
+                        self.forfeited = None
+                        self.build_unit_store()
+                        self.build_spatial_grid()
+                        self.build_influence()
                         if hasattr(self.affichage, 'set_battle_instance'):
                             self.affichage.set_battle_instance(self)
                         print("Battle loaded successfully!")
@@ -268,14 +428,19 @@ class Battle(GameMode):
             if not battle_continues:
                 # Battle ended - show final results
                 if getattr(self, "verbose", True):
-                    if self.army1.isEmpty():
+                    if self.forfeited is not None:
+                        side = 1 if self.forfeited is self.army1 else 2
+                        print(f"Battle Over: Army {side} forfeits (decision budget exceeded)")
+                    elif self.army1.isEmpty():
                         print("Battle Over: Army 2 wins!")
                     elif self.army2.isEmpty():
                         print("Battle Over: Army 1 wins!")
+                    elif self.stalemate:
+                        print(f"Battle Over: stalemate (no progress for {self.stalemate_ticks} ticks)")
                     elif self.max_tick and self.tick >= self.max_tick:
                         print(f"Battle Over: Reached max tick ({self.max_tick})")
-                        army1_count = len(self.army1.living_units())
-                        army2_count = len(self.army2.living_units())
+                        army1_count = self.army1.alive_count()
+                        army2_count = self.army2.alive_count()
                         print(f"Final: Army1={army1_count} units, Army2={army2_count} units")
                 if not getattr(self.affichage, "wait_for_close", True):
                     running = False
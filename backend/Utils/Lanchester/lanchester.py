@@ -5,7 +5,7 @@ Provides:
 - run_lanchester_dataset(...) to collect metrics over ranges and repeats
 - helpers to parse CLI expressions (types list, range)
 """
-from typing import Iterable, List, Tuple, Type
+from typing import Iterable, List, Optional, Tuple, Type
 
 from backend.Class.Army import Army
 from backend.Class.Map import Map
@@ -108,6 +108,7 @@ def run_lanchester_dataset(
     general_cls,
     repeats: int = 10,
     max_ticks: int = 500,
+    stalemate_ticks: Optional[int] = 100,
 ):
     """
     Run Lanchester(type, N) for each unit type and N in range, repeated `repeats` times.
@@ -115,11 +116,12 @@ def run_lanchester_dataset(
       {
         "unit_type": "<name>",
         "N": <int>,
-        "winner": "Army1"|"Army2"|"Draw",
+        "winner": "Army1"|"Army2"|"Draw"|"Stalemate",
         "casualties_winner": <float, avg over repeats>,
         "ticks_avg": <float>,
       }
     Casualties are computed for the winning side (so we can plot how costly the win is).
+    A run where nothing moved or lost HP for `stalemate_ticks` ticks stops early as "Stalemate".
     """
     rows = []
     for unit_name in unit_names:
@@ -138,7 +140,9 @@ def run_lanchester_dataset(
                 init_cnt1 = len(army1.units)
                 init_cnt2 = len(army2.units)
 
-                result = run_headless_battle(game_map, army1, army2, max_ticks=max_ticks)
+                result = run_headless_battle(
+                    game_map, army1, army2, max_ticks=max_ticks, stalemate_ticks=stalemate_ticks
+                )
 
                 surv1 = result["army1_survivors"]
                 surv2 = result["army2_survivors"]
@@ -155,7 +159,7 @@ def run_lanchester_dataset(
                     casualties = init_cnt2 - surv2
                     hp_lost = init_hp2 - hp2
                 else:
-                    winner = "Draw"
+                    winner = "Stalemate" if result["stalemate"] else "Draw"
                     # In draw, take the smaller casualties (best surviving side) to plot conservatively
                     casualties = min(init_cnt1 - surv1, init_cnt2 - surv2)
                     hp_lost = min(init_hp1 - hp1, init_hp2 - hp2)
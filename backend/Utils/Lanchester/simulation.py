@@ -2,27 +2,40 @@
 Headless battle runner for fast, non-visual simulations (e.g., Lanchester experiments).
 """
 
-from typing import Dict
+from typing import Dict, Optional
 
 from backend.Class.Army import Army
 from backend.Class.Map import Map
+from backend.GameModes.Battle import Battle
 
 
-def run_headless_battle(game_map: Map, army1: Army, army2: Army, max_ticks: int = 500) -> Dict[str, int]:
+def run_headless_battle(
+    game_map: Map,
+    army1: Army,
+    army2: Army,
+    max_ticks: int = 500,
+    stalemate_ticks: Optional[int] = None,
+) -> Dict[str, float]:
     """
-    Run a minimal, headless battle loop until one army is dead or max_ticks reached.
+    Run a minimal, headless battle loop until one army is dead, max_ticks is reached or
+    (when stalemate_ticks is set) nothing moved or lost HP for that many ticks.
     Returns survivors and remaining HP for both armies.
     """
-    tick = 0
-    while tick < max_ticks and not army1.isEmpty() and not army2.isEmpty():
-        army1.fight(game_map, otherArmy=army2)
-        army2.fight(game_map, otherArmy=army1)
-        tick += 1
+    battle = Battle()
+    battle.verbose = False
+    battle.stalemate_ticks = stalemate_ticks
+    battle.map = game_map
+    battle.army1 = army1
+    battle.army2 = army2
+    stats = battle.run_headless(max_ticks)
+    tick = battle.tick
 
     return {
-        "army1_survivors": len(army1.living_units()),
-        "army2_survivors": len(army2.living_units()),
+        "army1_survivors": army1.alive_count(),
+        "army2_survivors": army2.alive_count(),
         "army1_hp_remaining": sum(u.hp for u in army1.living_units()),
         "army2_hp_remaining": sum(u.hp for u in army2.living_units()),
         "ticks": tick,
+        "ticks_per_sec": stats["ticks_per_sec"],
+        "stalemate": battle.stalemate,
     }
\ No newline at end of file
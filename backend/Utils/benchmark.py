@@ -0,0 +1,135 @@
+"""
+Microbenchmark for the per-type living partitions of Army (ColonelArchBtw's main input).
+
+    python -m backend.Utils.benchmark --sizes 200,1000,5000
+
+For each army size it compares, for one tick:
+  - "scan"       : the old way, one `[e for e in living if isinstance(e, T)]` per unit and per type
+                   (timed on a sample of units and scaled to the whole army, the full run is quadratic);
+  - "filter"     : one filtered list per type and per tick over all the living units;
+  - "partitions" : the same per-type lists copied from Army.living_of();
+and times a full general decision (snapshot + decide, ColonelArchBtw by default) to check it grows about linearly.
+"""
+import argparse
+import random
+import time
+
+from backend.Class.Army import Army
+from backend.Class.Map import Map
+from backend.Class.Units.Crossbowman import Crossbowman
+from backend.Class.Units.Elephant import Elephant
+from backend.Class.Units.Knight import Knight
+from backend.Class.Units.Monk import Monk
+from backend.Class.Units.Pikeman import Pikeman
+from backend.GameModes.Battle import Battle
+from backend.Utils.class_by_name import GENERAL_REGISTRY
+from backend.Utils.snapshot import BattleSnapshot
+
+MIX = (Knight, Pikeman, Crossbowman, Crossbowman, Pikeman, Knight, Monk, Elephant)
+# types que ColonelArchBtw cherchait à chaque unité
+SCANNED_TYPES = (Pikeman, Knight, Crossbowman)
+SCAN_SAMPLE = 50
+
+
+def build_battle(n: int, seed: int = 0, general: str = "colonelarchbtw") -> Battle:
+    """Two armies of `n` mixed units facing each other, a few of them wounded."""
+    rng = random.Random(seed)
+    side = int(n ** 0.5) + 1
+    spacing = 1.5
+    width = side * spacing * 2 + 40
+
+    def spawn(x0):
+        army = Army()
+        for i in range(n):
+            unit = MIX[i % len(MIX)]((x0 + (i // side) * spacing, 5 + (i % side) * spacing))
+            army.add_unit(unit)
+            if rng.random() < 0.2:
+                unit.hp = max(1, unit.hp - rng.randint(1, 20))
+        return army
+
+    battle = Battle()
+    battle.verbose = False
+    battle.map = Map(int(width), int(side * spacing + 10))
+    battle.army1 = spawn(5)
+    battle.army2 = spawn(width / 2 + 10)
+    for army in (battle.army1, battle.army2):
+        army.gameMode = battle
+        commander = GENERAL_REGISTRY[general]()
+        army.general = commander
+        commander.army = army
+    battle.prepare()
+    return battle
+
+
+def bench_scan(army, enemy_army) -> float:
+    living = enemy_army.living_units()
+    sample = army.living_units()[:SCAN_SAMPLE]
+    start = time.perf_counter()
+    for _ in sample:
+        for cls in SCANNED_TYPES:
+            [e for e in living if isinstance(e, cls)]
+    elapsed = time.perf_counter() - start
+    return elapsed * army.alive_count() / max(1, len(sample))
+
+
+def bench_filter(army, enemy_army) -> float:
+    # une liste par type et par tour, filtrée sur tous les vivants (la vue partagée avant les partitions)
+    living = enemy_army.living_units()
+    start = time.perf_counter()
+    lists = {cls: [e for e in living if isinstance(e, cls)] for cls in SCANNED_TYPES}
+    for _ in army.living_units():
+        for cls in SCANNED_TYPES:
+            lists[cls]
+    return time.perf_counter() - start
+
+
+def bench_partitions(army, enemy_army) -> float:
+    # une copie de la partition par type et par tour (BattleSnapshot.enemies_of)
+    start = time.perf_counter()
+    lists = {cls: enemy_army.living_of(cls) for cls in SCANNED_TYPES}
+    for _ in army.living_units():
+        for cls in SCANNED_TYPES:
+            lists[cls]
+    return time.perf_counter() - start
+
+
+def bench_decide(battle, ticks: int) -> float:
+    army, enemy_army = battle.army1, battle.army2
+    general = army.general
+    start = time.perf_counter()
+    for _ in range(ticks):
+        general.snapshot = BattleSnapshot(army, enemy_army, battle.tick)
+        try:
+            general.decide(battle.map, enemy_army)
+        finally:
+            general.snapshot = None
+    return (time.perf_counter() - start) / ticks
+
+
+def run(sizes, ticks: int = 3, general: str = "colonelarchbtw"):
+    print(f"{'units/side':>10} | {'scan (ms)':>10} | {'filter (ms)':>11} | {'partitions (ms)':>15} | "
+          f"{'gain':>7} | {'decide (ms)':>11} | {'us/unit':>7}")
+    for n in sizes:
+        battle = build_battle(n, general=general)
+        scan = bench_scan(battle.army1, battle.army2)
+        filtered = bench_filter(battle.army1, battle.army2)
+        partitions = bench_partitions(battle.army1, battle.army2)
+        decide = bench_decide(battle, ticks)
+        gain = scan / partitions if partitions > 0 else float("inf")
+        print(f"{n:>10} | {scan * 1000:>10.1f} | {filtered * 1000:>11.2f} | {partitions * 1000:>15.2f} | {gain:>6.0f}x | "
+              f"{decide * 1000:>11.1f} | {decide * 1e6 / n:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-type partition microbenchmark")
+    parser.add_argument("--sizes", type=str, default="200,1000,5000",
+                        help="Comma-separated units per side (default: 200,1000,5000)")
+    parser.add_argument("--ticks", type=int, default=3, help="Decisions timed per size (default: 3)")
+    parser.add_argument("--general", "-g", type=str, default="colonelarchbtw",
+                        help=f"General timed in the decide column (available: {', '.join(GENERAL_REGISTRY)})")
+    args = parser.parse_args()
+    run([int(s) for s in args.sizes.split(",")], args.ticks, args.general.lower())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from backend.Class.Generals.CaptainBraindead import CaptainBraindead
+from backend.Class.Generals.ClusterDaft import ClusterDaft
 from backend.Class.Generals.ColonelArchBtw import ColonelArchBtw
 from backend.Class.Generals.GeneralClever import GeneralClever
 from backend.Class.Generals.MajorDaft import MajorDaft
@@ -14,6 +15,7 @@ GENERAL_REGISTRY: dict[str, type] = {
             "majordaft": MajorDaft,
             "generalclever": GeneralClever,
             "colonelarchbtw": ColonelArchBtw,
+            "clusterdaft": ClusterDaft,
             "clever" : GeneralClever,
             "daft" : MajorDaft,
         }
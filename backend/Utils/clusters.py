@@ -0,0 +1,68 @@
+"""
+Group-level targeting for big battles (see backend/Class/Generals/ClusterTargeting.py).
+Each turn both armies are binned on a coarse grid: the units of one cell form a
+cluster, placed at their centroid. Each allied cluster is matched once with the
+closest enemy cluster, and a unit then only looks for its target among the
+members of that enemy cluster. The matching costs O(clusters) per turn and the
+per-unit search only sees one small cluster instead of the whole enemy army.
+"""
+from math import floor
+
+from backend.Utils.nearest import NearestIndex
+
+
+class Cluster:
+    __slots__ = ("key", "members", "position", "_index")
+
+    def __init__(self, key, members):
+        self.key = key
+        self.members = members
+        n = len(members)
+        self.position = (sum(u.position[0] for u in members) / n, sum(u.position[1] for u in members) / n)
+        self._index = None
+
+    def index(self) -> NearestIndex:
+        if self._index is None:
+            self._index = NearestIndex(self.members)
+        return self._index
+
+
+def grid_clusters(units, cell_size: float):
+    """Clusters of the placed units, one per occupied grid cell, in order of their first member."""
+    cells = {}
+    for unit in units:
+        position = unit.position
+        if position is None:
+            continue
+        cells.setdefault((floor(position[0] / cell_size), floor(position[1] / cell_size)), []).append(unit)
+    return [Cluster(key, members) for key, members in cells.items()]
+
+
+class ClusterTargets:
+
+    def __init__(self, allies, enemies, cell_size: float):
+        self.cell_size = cell_size
+        self.ally_clusters = grid_clusters(allies, cell_size)
+        self.enemy_clusters = grid_clusters(enemies, cell_size)
+        self._cluster_of = {u: c for c in self.ally_clusters for u in c.members}
+        self._enemy_index = NearestIndex(self.enemy_clusters)
+        self._matched = {}  # clé du groupe allié -> groupe ennemi choisi
+        self.pairs = 0      # décisions prises au niveau des groupes ce tour
+
+    def match(self, cluster) -> Cluster:
+        """Enemy cluster assigned to an allied cluster: the one whose centroid is closest."""
+        enemy = self._matched.get(cluster.key)
+        if enemy is None and cluster.key not in self._matched:
+            enemy = self._matched[cluster.key] = self._enemy_index.nearest(cluster.position)
+            self.pairs += 1
+        return enemy
+
+    def target_for(self, unit):
+        """Closest member of the enemy cluster matched with the unit's cluster, or None if the unit is unplaced."""
+        cluster = self._cluster_of.get(unit)
+        if cluster is None:
+            return None
+        enemy = self.match(cluster)
+        if enemy is None:
+            return None
+        return enemy.index().nearest(unit.position)
@@ -0,0 +1,207 @@
+"""
+Combat resolution helpers.
+Unit stats, classes and bonuses are fixed per unit type, so the damage one
+type deals to another and the distance at which it can engage it never change
+during a battle: CombatTable computes them once per (attacker type, target
+type). Army and the generals share the module-level COMBAT_TABLE instead of
+summing bonuses over `target.classes` or recomputing
+`(range + size/2 + size/2) ** 2` for every pair. resolve_attacks applies a
+whole batch of attacks at once using that table.
+"""
+import random
+
+from backend.Class.Units.Castle import Castle
+from backend.Class.Units.Crossbowman import Crossbowman
+from backend.Class.Units.Elephant import Elephant
+from backend.Class.Units.Knight import Knight
+from backend.Class.Units.Monk import Monk
+from backend.Class.Units.Pikeman import Pikeman
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# below this many attacks the plain Python loop is cheaper than building arrays
+BATCH_MIN_ATTACKS = 16
+
+UNIT_TYPES = (Knight, Pikeman, Crossbowman, Monk, Elephant, Castle)
+
+# Crossbow dodge mechanic (rare miss, scales with target speed)
+CROSSBOW_BASE_MISS = 0.08  # 8% base dodge chance
+CROSSBOW_MISS_PER_SPEED = 0.015  # +1.5% per extra speed
+CROSSBOW_MISS_CAP = 0.20  # cap at 20%
+
+
+def compute_damage(unit, target) -> int:
+    """Damage applied by one hit of `unit` on `target` (bonuses minus armor, never negative)."""
+    bonus = 0
+    for classe in target.classes:
+        bonus += unit.bonuses.get(classe, 0)
+    return max(0, (unit.attack + bonus) - target.armor)
+
+
+def compute_engage_r2(unit, target) -> float:
+    """Squared distance under which `unit` can act on `target` (edge to edge range)."""
+    range_ = unit.range
+    if isinstance(unit, Monk) and (isinstance(target, Elephant) or isinstance(target, Castle)):
+        range_ = unit.convert_range
+    return (range_ + unit.size / 2 + target.size / 2) ** 2
+
+
+def compute_dodge_chance(target) -> float:
+    speed_factor = CROSSBOW_MISS_PER_SPEED * max(0, target.speed - 1)
+    return min(CROSSBOW_MISS_CAP, CROSSBOW_BASE_MISS + speed_factor)
+
+
+class CombatTable:
+
+    def __init__(self, unit_types=UNIT_TYPES):
+        self.unit_types = list(unit_types)
+        self.type_index = {cls: i for i, cls in enumerate(self.unit_types)}
+        # one reference instance per type: the stats are the same for every unit of a type
+        self._samples = [cls((0, 0)) for cls in self.unit_types]
+        self.damage_matrix = [[compute_damage(a, t) for t in self._samples] for a in self._samples]
+        self.engage_r2_matrix = [[compute_engage_r2(a, t) for t in self._samples] for a in self._samples]
+        self.dodge_chances = [compute_dodge_chance(t) for t in self._samples]
+        self.is_crossbow = [issubclass(cls, Crossbowman) for cls in self.unit_types]
+        self._damage = {}
+        self._engage_r2 = {}
+        for i, a in enumerate(self.unit_types):
+            for j, t in enumerate(self.unit_types):
+                self._damage[(a, t)] = self.damage_matrix[i][j]
+                self._engage_r2[(a, t)] = self.engage_r2_matrix[i][j]
+        self._build_arrays()
+
+    def _build_arrays(self):
+        if np is not None:
+            self.damage_array = np.array(self.damage_matrix, dtype=np.int64)
+            self.engage_r2_array = np.array(self.engage_r2_matrix, dtype=np.float64)
+            self.dodge_array = np.array(self.dodge_chances, dtype=np.float64)
+            self.crossbow_array = np.array(self.is_crossbow, dtype=bool)
+
+    def index_of(self, unit) -> int:
+        """Row/column of the unit's type, registering unknown types on the fly."""
+        cls = type(unit)
+        idx = self.type_index.get(cls)
+        if idx is None:
+            idx = self._register(cls, unit)
+        return idx
+
+    def damage(self, unit, target) -> int:
+        value = self._damage.get((type(unit), type(target)))
+        if value is None:
+            self.index_of(unit)
+            self.index_of(target)
+            value = self._damage[(type(unit), type(target))]
+        return value
+
+    def engage_r2(self, unit, target) -> float:
+        value = self._engage_r2.get((type(unit), type(target)))
+        if value is None:
+            self.index_of(unit)
+            self.index_of(target)
+            value = self._engage_r2[(type(unit), type(target))]
+        return value
+
+    def dodge_chance(self, target) -> float:
+        return self.dodge_chances[self.index_of(target)]
+
+    def _register(self, cls, sample):
+        idx = len(self.unit_types)
+        self.unit_types.append(cls)
+        self.type_index[cls] = idx
+        self._samples.append(sample)
+        for attacker, row, engage_row in zip(self._samples, self.damage_matrix, self.engage_r2_matrix):
+            row.append(compute_damage(attacker, sample))
+            engage_row.append(compute_engage_r2(attacker, sample))
+        self.damage_matrix.append([compute_damage(sample, t) for t in self._samples])
+        self.engage_r2_matrix.append([compute_engage_r2(sample, t) for t in self._samples])
+        self.dodge_chances.append(compute_dodge_chance(sample))
+        self.is_crossbow.append(issubclass(cls, Crossbowman))
+        for i, a in enumerate(self.unit_types):
+            self._damage[(a, cls)] = self.damage_matrix[i][idx]
+            self._damage[(cls, a)] = self.damage_matrix[idx][i]
+            self._engage_r2[(a, cls)] = self.engage_r2_matrix[i][idx]
+            self._engage_r2[(cls, a)] = self.engage_r2_matrix[idx][i]
+        self._build_arrays()
+        return idx
+
+
+COMBAT_TABLE = CombatTable()
+
+
+def resolve_attacks(attacks, table: CombatTable = COMBAT_TABLE):
+    """
+    Apply a batch of "attack" actions with the same result as handling them one by one:
+    crossbow dodge rolls are drawn in action order, damage is summed per target and
+    the hp is clamped at 0 once, and cooldown / last_attacker / last_attacked follow
+    the action order. Returns True if any hp actually changed.
+    """
+    if not attacks:
+        return False
+    if np is not None and len(attacks) >= BATCH_MIN_ATTACKS:
+        hits, damage_by_target = _resolve_numpy(attacks, table)
+    else:
+        hits, damage_by_target = _resolve_python(attacks, table)
+
+    for action, hit in zip(attacks, hits):
+        unit, target = action.unit, action.target
+        unit.cooldown = unit.reload_time
+        if hit:
+            unit.last_attacked = target
+            target.last_attacker = unit
+        # miss / dodge: only consume reload time
+
+    changed = False
+    for target, damage in damage_by_target.items():
+        old_hp = target.hp
+        hp = old_hp - damage
+        hp = hp if hp > 0 else 0
+        target.hp = hp
+        if hp != old_hp:
+            changed = True
+    return changed
+
+
+def _resolve_python(attacks, table):
+    hits = []
+    damage_by_target = {}
+    for action in attacks:
+        unit, target = action.unit, action.target
+        if table.is_crossbow[table.index_of(unit)] and random.random() < table.dodge_chance(target):
+            hits.append(False)
+            continue
+        hits.append(True)
+        damage_by_target[target] = damage_by_target.get(target, 0) + table.damage(unit, target)
+    return hits, damage_by_target
+
+
+def _resolve_numpy(attacks, table):
+    n = len(attacks)
+    attacker_idx = np.fromiter((table.index_of(a.unit) for a in attacks), dtype=np.intp, count=n)
+    target_idx = np.fromiter((table.index_of(a.target) for a in attacks), dtype=np.intp, count=n)
+    damage = table.damage_array[attacker_idx, target_idx]
+
+    hit = np.ones(n, dtype=bool)
+    crossbow = table.crossbow_array[attacker_idx]
+    n_rolls = int(crossbow.sum())
+    if n_rolls:
+        # one roll per crossbow shot, drawn from `random` in action order so seeded games stay reproducible
+        rolls = np.array([random.random() for _ in range(n_rolls)])
+        hit[crossbow] = rolls >= table.dodge_array[target_idx[crossbow]]
+
+    # scatter: one accumulate step over the distinct targets
+    slot_of = {}
+    slots = np.fromiter((slot_of.setdefault(a.target, len(slot_of)) for a in attacks), dtype=np.intp, count=n)
+    totals = np.zeros(len(slot_of), dtype=np.int64)
+    np.add.at(totals, slots[hit], damage[hit])
+    touched = np.zeros(len(slot_of), dtype=bool)
+    touched[slots[hit]] = True
+
+    damage_by_target = {
+        target: total
+        for target, total, was_hit in zip(slot_of, totals.tolist(), touched.tolist())
+        if was_hit
+    }
+    return hit.tolist(), damage_by_target
@@ -0,0 +1,38 @@
+"""
+Wall-clock budget for the generals' decisions.
+Army.fight times General.decide every tick into the general's DecisionTimer.
+When the battle sets `decision_budget` (seconds per decision), a late decision is
+handled according to `budget_mode`:
+  - "warn"     : the orders are used anyway, the overrun is reported once per general;
+  - "fallback" : the late orders are dropped and last tick's orders are replayed;
+  - "forfeit"  : the late army loses the battle on the spot.
+"""
+BUDGET_MODES = ("warn", "fallback", "forfeit")
+
+
+class DecisionTimer:
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0        # secondes
+        self.worst = 0.0
+        self.over_budget = 0    # décisions qui ont dépassé le budget
+
+    def record(self, elapsed: float, budget: float = None) -> bool:
+        """Add one decision time; True if it went over `budget`."""
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.worst:
+            self.worst = elapsed
+        if budget is not None and elapsed > budget:
+            self.over_budget += 1
+            return True
+        return False
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.calls} decisions, mean {self.mean * 1000:.2f} ms, "
+                f"worst {self.worst * 1000:.2f} ms, {self.over_budget} over budget")
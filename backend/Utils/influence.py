@@ -0,0 +1,99 @@
+"""
+Optional per-army influence rasters over the Map, refreshed by Battle every
+`influence_every` ticks (see Battle.refresh_influence).
+Each army gets three layers on a grid of `cell_size` cells:
+  - "damage" : damage potential per tick (attack / reload_time) within `radius` cells;
+  - "hp"     : hp mass within `radius` cells;
+  - "ranged" : damage potential of the ranged units (range > 1) over the area they cover.
+Units are splatted into their cell with one bincount, then spread with a
+separable box blur (cumulative sums along each axis), so a refresh costs
+O(units + cells) and a query is a single array read.
+
+NumPy is optional: InfluenceMap raises ImportError without it and Battle
+keeps running without influence maps.
+"""
+from math import ceil
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LAYERS = ("damage", "hp", "ranged")
+
+
+class InfluenceMap:
+
+    def __init__(self, width: float, height: float, cell_size: float = 2.0, radius: int = 2):
+        if np is None:
+            raise ImportError("numpy is required for influence maps")
+        self.cell_size = cell_size
+        self.radius = radius  # rayon du flou des couches "damage" et "hp", en cellules
+        self.shape = (max(1, ceil(height / cell_size)), max(1, ceil(width / cell_size)))
+        self.layers = {name: np.zeros(self.shape) for name in LAYERS}
+        self.tick = None  # tick du dernier rafraîchissement
+
+    def refresh(self, units, tick=None):
+        """Recompute every layer from `units` (the living units of one army)."""
+        placed = [u for u in units if u.position is not None]
+        rows, cols = self.shape
+        self.tick = tick
+        if not placed:
+            for name in LAYERS:
+                self.layers[name] = np.zeros(self.shape)
+            return
+
+        n = len(placed)
+        xy = np.array([u.position for u in placed], dtype=np.float64)
+        ix = np.clip((xy[:, 0] // self.cell_size).astype(np.intp), 0, cols - 1)
+        iy = np.clip((xy[:, 1] // self.cell_size).astype(np.intp), 0, rows - 1)
+        flat = iy * cols + ix
+        hp = np.fromiter((u.hp for u in placed), dtype=np.float64, count=n)
+        damage = np.fromiter((u.attack / max(1, u.reload_time) for u in placed), dtype=np.float64, count=n)
+        reach = np.fromiter((u.range for u in placed), dtype=np.float64, count=n)
+        ranged = reach > 1
+
+        def splat(weights, mask=None):
+            cells = flat if mask is None else flat[mask]
+            return np.bincount(cells, weights=weights, minlength=rows * cols).reshape(self.shape)
+
+        self.layers["damage"] = _box_blur(splat(damage), self.radius)
+        self.layers["hp"] = _box_blur(splat(hp), self.radius)
+        if ranged.any():
+            # une unité à distance couvre la zone à portée de tir autour d'elle
+            cover = int(ceil(reach[ranged].max() / self.cell_size))
+            self.layers["ranged"] = _box_blur(splat(damage[ranged], ranged), cover)
+        else:
+            self.layers["ranged"] = np.zeros(self.shape)
+
+    # --- requêtes ---------------------------------------------------------------
+    def cell(self, x: float, y: float):
+        rows, cols = self.shape
+        return min(max(int(y // self.cell_size), 0), rows - 1), min(max(int(x // self.cell_size), 0), cols - 1)
+
+    def at(self, layer: str, x: float, y: float) -> float:
+        """Value of `layer` in the cell containing (x, y) (clamped to the map)."""
+        return float(self.layers[layer][self.cell(x, y)])
+
+    def peak(self, layer: str):
+        """Centre (x, y) of the strongest cell of `layer`."""
+        row, col = np.unravel_index(int(self.layers[layer].argmax()), self.shape)
+        return ((col + 0.5) * self.cell_size, (row + 0.5) * self.cell_size)
+
+
+def _box_sum(a, r, axis):
+    # somme glissante sur 2r+1 cellules le long d'un axe, avec des zéros hors de la carte
+    n = a.shape[axis]
+    pad = [(0, 0), (0, 0)]
+    pad[axis] = (r + 1, r)
+    c = np.cumsum(np.pad(a, pad), axis=axis)
+    hi = np.take(c, np.arange(2 * r + 1, 2 * r + 1 + n), axis=axis)
+    lo = np.take(c, np.arange(0, n), axis=axis)
+    return hi - lo
+
+
+def _box_blur(a, r):
+    """Sum of `a` over the (2r+1) x (2r+1) square around each cell, as two 1D passes."""
+    if r <= 0:
+        return a
+    return _box_sum(_box_sum(a, r, 0), r, 1)
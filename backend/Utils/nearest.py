@@ -0,0 +1,155 @@
+"""
+Nearest-neighbour queries over a fixed list of units (one turn of a battle).
+Units are bucketed in a uniform grid once; nearest / k-nearest / radius queries
+then walk the cells in rings around the query point and stop as soon as no
+unvisited cell can hold anything closer.
+
+Results are exactly what a linear scan would give: distances use the same
+formula as the generals, and ties go to the unit that comes first in the list
+(like min()), so switching a general to this index does not change its choices.
+"""
+import heapq
+from math import floor
+
+# en dessous, une boucle simple est plus rapide que la grille
+LINEAR_MAX = 24
+
+
+class NearestIndex:
+
+    def __init__(self, units, cell_size: float = None):
+        self.units = tuple(units)
+        self._placed = [(i, u, u.position) for i, u in enumerate(self.units) if u.position is not None]
+        self._cells = None
+        if len(self._placed) <= LINEAR_MAX:
+            return
+
+        xs = [p[0] for _, _, p in self._placed]
+        ys = [p[1] for _, _, p in self._placed]
+        if cell_size is None:
+            # environ deux unités par cellule en moyenne
+            area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+            cell_size = max(1.0, (2 * area / len(self._placed)) ** 0.5)
+        self.cell_size = cell_size
+        cells = {}
+        for i, unit, (x, y) in self._placed:
+            cells.setdefault((floor(x / cell_size), floor(y / cell_size)), []).append((i, unit, x, y))
+        self._cells = cells
+        keys = cells.keys()
+        self._cx_min = min(k[0] for k in keys)
+        self._cx_max = max(k[0] for k in keys)
+        self._cy_min = min(k[1] for k in keys)
+        self._cy_max = max(k[1] for k in keys)
+
+    def __len__(self):
+        return len(self.units)
+
+    # --- requêtes ---------------------------------------------------------------
+    def nearest(self, position, max_dist_sq=None, exclude=None):
+        """
+        Closest unit to `position` (first in list order on ties), or None.
+        With `max_dist_sq`, only units strictly closer than that count.
+        Units in `exclude` are skipped.
+        """
+        if position is None:
+            # tout est à distance infinie : min() rendrait le premier
+            if max_dist_sq is not None:
+                return None
+            return next((u for u in self.units if not exclude or u not in exclude), None)
+        x, y = position
+        best = None
+        best_d = float("inf") if max_dist_sq is None else max_dist_sq
+        best_i = -1
+        for i, unit, ux, uy in self._candidates(x, y, lambda: best_d):
+            if exclude and unit in exclude:
+                continue
+            d = (x - ux) ** 2 + (y - uy) ** 2
+            if d < best_d or (d == best_d and best is not None and i < best_i):
+                best, best_d, best_i = unit, d, i
+        if best is None and max_dist_sq is None:
+            # seulement des unités sans position : comme min(), on rend la première
+            return next((u for u in self.units if u.position is None and (not exclude or u not in exclude)), None)
+        return best
+
+    def k_nearest(self, position, k, exclude=None):
+        """The k closest placed units, closest first (list order on ties)."""
+        if position is None or k <= 0:
+            return []
+        x, y = position
+        heap = []  # (-d, -i, unit) : le pire des k en tête
+
+        def bound():
+            return -heap[0][0] if len(heap) == k else float("inf")
+
+        for i, unit, ux, uy in self._candidates(x, y, bound):
+            if exclude and unit in exclude:
+                continue
+            item = (-((x - ux) ** 2 + (y - uy) ** 2), -i, unit)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        return [unit for _, _, unit in sorted(heap, key=lambda item: (-item[0], -item[1]))]
+
+    def within(self, position, radius):
+        """Placed units at distance <= radius, in list order."""
+        if position is None:
+            return []
+        x, y = position
+        r2 = radius * radius
+        if self._cells is None:
+            return [u for _, u, (ux, uy) in self._placed if (x - ux) ** 2 + (y - uy) ** 2 <= r2]
+        cs = self.cell_size
+        found = []
+        for cx in range(floor((x - radius) / cs), floor((x + radius) / cs) + 1):
+            for cy in range(floor((y - radius) / cs), floor((y + radius) / cs) + 1):
+                for i, unit, ux, uy in self._cells.get((cx, cy), ()):
+                    if (x - ux) ** 2 + (y - uy) ** 2 <= r2:
+                        found.append((i, unit))
+        found.sort(key=lambda item: item[0])
+        return [unit for _, unit in found]
+
+    # --- parcours en anneaux ---------------------------------------------------
+    def _candidates(self, x, y, current_bound):
+        """
+        Yield (index, unit, x, y) for every unit that may be closer than current_bound(),
+        ring by ring around (x, y). The bound is re-read before each ring.
+        """
+        if self._cells is None:
+            for i, unit, (ux, uy) in self._placed:
+                yield i, unit, ux, uy
+            return
+        cs = self.cell_size
+        cells = self._cells
+        x0, x1, y0, y1 = self._cx_min, self._cx_max, self._cy_min, self._cy_max
+        cx, cy = floor(x / cs), floor(y / cs)
+        # les anneaux qui n'atteignent pas la boîte des cellules occupées sont vides : on les saute
+        first_ring = max(0, x0 - cx, cx - x1, y0 - cy, cy - y1)
+        max_ring = max(cx - x0, x1 - cx, cy - y0, y1 - cy)
+        for ring in range(first_ring, max_ring + 1):
+            if ring >= 2:
+                # tout point de cet anneau est au moins à (ring - 1) cellules sur un des axes
+                gap = (ring - 1) * cs
+                if gap * gap > current_bound():
+                    return
+            for key in _ring_keys(cx, cy, ring, x0, x1, y0, y1):
+                bucket = cells.get(key)
+                if bucket:
+                    yield from bucket
+
+
+def _ring_keys(cx, cy, ring, x0, x1, y0, y1):
+    """Cells of the square ring at Chebyshev distance `ring` from (cx, cy), clipped to [x0, x1] x [y0, y1]."""
+    if ring == 0:
+        yield cx, cy
+        return
+    lo, hi = max(cx - ring, x0), min(cx + ring, x1)
+    for y in (cy - ring, cy + ring):
+        if y0 <= y <= y1:
+            for x in range(lo, hi + 1):
+                yield x, y
+    lo, hi = max(cy - ring + 1, y0), min(cy + ring - 1, y1)
+    for x in (cx - ring, cx + ring):
+        if x0 <= x <= x1:
+            for y in range(lo, hi + 1):
+                yield x, y
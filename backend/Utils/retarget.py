@@ -0,0 +1,67 @@
+"""
+Target stickiness between General.getTargets and Army.testTargets.
+A general with `sticky_targets = True` keeps last turn's (unit, target) pairs and
+is only asked to decide again for the units whose target is no longer good:
+it died or was converted, it left the unit's line of sight, another living
+enemy attacked the unit, or some enemy is now closer than it by more than
+`retarget_margin`. Monks always decide again (heal / convert depends on reload).
+
+The general sees which units to decide for through BattleSnapshot.decides(unit).
+"""
+from backend.Class.Units.Monk import Monk
+from backend.Utils.snapshot import distance_sq
+
+
+class Retargeter:
+
+    def __init__(self, margin: float = 1.0):
+        self.margin = margin
+        self.previous = {}  # unit -> cible du tour précédent
+        self.kept = 0       # décisions évitées depuis le début de la bataille
+        self.decided = 0    # décisions demandées au général
+
+    def targets(self, general, map, otherArmy):
+        view = general.snapshot
+        kept = {}
+        for unit in view.allies:
+            target = self.previous.get(unit)
+            if target is not None and self._still_good(unit, target, view):
+                kept[unit] = target
+        view.deciding = frozenset(u for u in view.allies if u not in kept)
+        fresh = general.getTargets(map, otherArmy)
+        if isinstance(fresh, dict):
+            fresh = list(fresh.items())
+        self.kept += len(kept)
+        self.decided += len(view.deciding)
+
+        # ordre des unités vivantes, comme si le général avait tout recalculé
+        fresh = dict(fresh)
+        targets = []
+        for unit in view.allies:
+            target = kept.get(unit)
+            if target is None:
+                target = fresh.get(unit)
+            if target is not None:
+                targets.append((unit, target))
+        self.previous = dict(targets)
+        return targets
+
+    def _still_good(self, unit, target, view):
+        if isinstance(unit, Monk):
+            return False
+        enemy_army = view.enemy_army
+        if not enemy_army.is_living(target):
+            return False  # morte ou convertie
+        if unit.position is None or target.position is None:
+            return False
+        last_attacker = unit.last_attacker
+        if last_attacker is not target and enemy_army.is_living(last_attacker):
+            return False
+        d2 = distance_sq(unit, target)
+        if d2 >= unit.line_of_sight ** 2:
+            return False
+        # une autre cible nettement plus proche ?
+        reach = d2 ** 0.5 - self.margin
+        if reach > 0 and view.nearest_enemy(unit, max_dist_sq=reach * reach) is not None:
+            return False
+        return True
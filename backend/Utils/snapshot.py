@@ -0,0 +1,173 @@
+"""
+Read-only view of the battlefield taken once per army turn, right before the
+general's getTargets (see Army.fight).
+The living units of both sides, their positions / hp, the per-type lists and
+the wounded allies (from the army's wounded index) are derived once here instead of once per unit in every
+general, and nearest-neighbour queries go through per-turn grid indexes
+(backend/Utils/nearest.py). Lists are tuples in living order, so a general
+iterating them picks the same units (and breaks ties the same way) as with
+army.living_units().
+"""
+from functools import cached_property
+
+from backend.Utils.nearest import NearestIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def distance_sq(u1, u2) -> float:
+    # même formule que les généraux, None = infiniment loin
+    if u1.position is None or u2.position is None:
+        return float("inf")
+    x1, y1 = u1.position
+    x2, y2 = u2.position
+    return (x1 - x2) ** 2 + (y1 - y2) ** 2
+
+
+class BattleSnapshot:
+
+    def __init__(self, army, enemy_army, tick=None):
+        self.army = army
+        self.enemy_army = enemy_army
+        self.tick = tick
+        self.allies = tuple(army.living_units())
+        self.enemies = tuple(enemy_army.living_units())
+        self._allies_of = {}
+        self._enemies_of = {}
+        self._indexes = {}
+        # unités pour lesquelles le général doit décider ce tour (None = toutes, voir backend/Utils/retarget.py)
+        self.deciding = None
+        # ciblage par groupes posé par ClusterTargeting (backend/Utils/clusters.py), None = ciblage unité par unité
+        self.clusters = None
+
+    def decides(self, unit) -> bool:
+        return self.deciding is None or unit in self.deciding
+
+    # --- positions / pv alignés sur allies / enemies -------------------------
+    @cached_property
+    def ally_positions(self):
+        return tuple(u.position for u in self.allies)
+
+    @cached_property
+    def enemy_positions(self):
+        return tuple(u.position for u in self.enemies)
+
+    @cached_property
+    def ally_hp(self):
+        return tuple(u.hp for u in self.allies)
+
+    @cached_property
+    def enemy_hp(self):
+        return tuple(u.hp for u in self.enemies)
+
+    @cached_property
+    def enemy_xy(self):
+        """(M, 2) float array of enemy positions (NaN when unplaced), None without numpy."""
+        return _xy_array(self.enemy_positions)
+
+    @cached_property
+    def ally_xy(self):
+        return _xy_array(self.ally_positions)
+
+    # --- cartes d'influence (None si la bataille n'en tient pas) ---------------
+    @property
+    def influence(self):
+        return getattr(self.army, "influence", None)
+
+    @property
+    def enemy_influence(self):
+        return getattr(self.enemy_army, "influence", None)
+
+    # --- listes dérivées --------------------------------------------------------
+    @cached_property
+    def wounded_allies(self):
+        # index des blessés tenu par l'armée : pas de parcours de toute l'armée
+        return tuple(self.army.wounded_units())
+
+    def allies_of(self, cls):
+        """Living allies that are instances of `cls` (tuple, living order), from the army's per-type partition."""
+        found = self._allies_of.get(cls)
+        if found is None:
+            found = self._allies_of[cls] = tuple(self.army.living_of(cls))
+        return found
+
+    def enemies_of(self, cls):
+        found = self._enemies_of.get(cls)
+        if found is None:
+            found = self._enemies_of[cls] = tuple(self.enemy_army.living_of(cls))
+        return found
+
+    # --- voisinage --------------------------------------------------------------
+    def index(self, enemies: bool, cls=None) -> NearestIndex:
+        """Nearest-neighbour index over the enemies (or allies), optionally of one type; built on first use."""
+        key = (enemies, cls)
+        index = self._indexes.get(key)
+        if index is None:
+            if cls is None:
+                units = self.enemies if enemies else self.allies
+            else:
+                units = self.enemies_of(cls) if enemies else self.allies_of(cls)
+            index = self._indexes[key] = NearestIndex(units)
+        return index
+
+    def nearest_enemy(self, unit, cls=None, max_dist_sq=None, exclude=None):
+        """
+        Same answer as nearest(unit, <enemies of cls>, max_dist_sq) minus `exclude`, without the full scan.
+        With group targeting on, a plain query (no type, limit or exclusion) answers within the matched enemy cluster.
+        """
+        if self.clusters is not None and cls is None and max_dist_sq is None and not exclude:
+            target = self.clusters.target_for(unit)
+            if target is not None:
+                return target
+        return self.index(True, cls).nearest(unit.position, max_dist_sq, exclude)
+
+    def nearest_ally(self, unit, cls=None, max_dist_sq=None, exclude=None):
+        return self.index(False, cls).nearest(unit.position, max_dist_sq, exclude)
+
+    def nearest_enemies(self, unit, k, cls=None):
+        return self.index(True, cls).k_nearest(unit.position, k)
+
+    def enemies_within(self, unit, radius, cls=None):
+        return self.index(True, cls).within(unit.position, radius)
+
+    def wounded_index(self, cls=None, min_missing=0) -> NearestIndex:
+        """Index over the wounded allies (of type `cls`) missing more than `min_missing` hp; built on first use."""
+        key = ("wounded", cls, min_missing)
+        index = self._indexes.get(key)
+        if index is None:
+            units = [u for u in self.wounded_allies
+                     if u.max_hp - u.hp > min_missing and (cls is None or isinstance(u, cls))]
+            index = self._indexes[key] = NearestIndex(units)
+        return index
+
+    def nearest_wounded(self, unit, cls=None, min_missing=0, max_dist_sq=None, exclude=None):
+        """Closest wounded ally for a healer (same answer as nearest() over the filtered wounded list)."""
+        return self.wounded_index(cls, min_missing).nearest(unit.position, max_dist_sq, exclude)
+
+    @staticmethod
+    def nearest(unit, candidates, max_dist_sq=None):
+        """
+        Closest of `candidates` to `unit` (first one on ties, like min()), or None.
+        With `max_dist_sq`, candidates at that squared distance or further are ignored.
+        """
+        best, best_d = None, None
+        for other in candidates:
+            d = distance_sq(unit, other)
+            if best is None or d < best_d:
+                best, best_d = other, d
+        if max_dist_sq is not None and best is not None and not best_d < max_dist_sq:
+            return None
+        return best
+
+
+def _xy_array(positions):
+    if np is None:
+        return None
+    xy = np.full((len(positions), 2), np.nan)
+    for i, position in enumerate(positions):
+        if position is not None:
+            xy[i] = position
+    return xy
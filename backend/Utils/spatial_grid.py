@@ -0,0 +1,94 @@
+"""
+Uniform-grid spatial hash used to speed up collision tests.
+Units and obstacles are bucketed by the cell containing their position, so a
+query only has to look at the few cells overlapping a small box instead of
+every object on the battlefield.
+"""
+from math import floor
+
+
+class SpatialGrid:
+
+    def __init__(self, cell_size: float = 2.0):
+        self.cell_size = cell_size
+        self._cells = {}    # (cx, cy) -> set of objects
+        self._cell_of = {}  # object -> (cx, cy)
+        # biggest object ever inserted, used to widen queries so that large
+        # objects (castles) whose centre lies outside the box are still found
+        self.max_size = 0
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def __len__(self):
+        return len(self._cell_of)
+
+    def __contains__(self, obj):
+        return obj in self._cell_of
+
+    def insert(self, obj):
+        if obj.position is None:
+            return
+        key = self.cell(obj.position[0], obj.position[1])
+        self._cells.setdefault(key, set()).add(obj)
+        self._cell_of[obj] = key
+        if obj.size > self.max_size:
+            self.max_size = obj.size
+
+    def remove(self, obj):
+        key = self._cell_of.pop(obj, None)
+        if key is None:
+            return
+        bucket = self._cells[key]
+        bucket.discard(obj)
+        if not bucket:
+            del self._cells[key]
+
+    def move(self, obj):
+        """Re-bucket an object after its position changed."""
+        old = self._cell_of.get(obj)
+        if obj.position is None:
+            self.remove(obj)
+            return
+        new = self.cell(obj.position[0], obj.position[1])
+        if old == new:
+            return
+        if old is not None:
+            self.remove(obj)
+        self._cells.setdefault(new, set()).add(obj)
+        self._cell_of[obj] = new
+
+    def query_box(self, x_min: float, y_min: float, x_max: float, y_max: float):
+        """Yield every object stored in a cell overlapping the box (may include objects outside it)."""
+        cx_min, cy_min = self.cell(x_min, y_min)
+        cx_max, cy_max = self.cell(x_max, y_max)
+        cells = self._cells
+        for cx in range(cx_min, cx_max + 1):
+            for cy in range(cy_min, cy_max + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query_radius(self, x: float, y: float, radius: float):
+        """Yield the objects whose centre is within `radius` of (x, y)."""
+        r2 = radius * radius
+        for obj in self.query_box(x - radius, y - radius, x + radius, y + radius):
+            px, py = obj.position
+            if (x - px) ** 2 + (y - py) ** 2 <= r2:
+                yield obj
+
+    def clear(self):
+        self._cells.clear()
+        self._cell_of.clear()
+        self.max_size = 0
+
+    def rebuild(self, armies, obstacles=()):
+        """Index every unit of the given armies plus the map obstacles."""
+        self.clear()
+        for army in armies:
+            if army is None:
+                continue
+            for unit in army.units:
+                self.insert(unit)
+        for obstacle in obstacles:
+            self.insert(obstacle)
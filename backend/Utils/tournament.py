@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Sequence, Tuple
 
 from backend.GameModes.Battle import Battle
 from backend.Utils.class_by_name import GENERAL_REGISTRY
+from backend.Utils.decision_budget import BUDGET_MODES
 from backend.Utils.scenarios import (
     SCENARIO_REGISTRY,
     get_available_scenarios,
@@ -47,11 +48,23 @@ class MatchResult:
     ticks: int
     army1_survivors: int
     army2_survivors: int
+    ticks_per_sec: float = 0.0
+    decisions_saved: int = 0  # targets kept by the sticky-target layer instead of re-deciding
+    plan_time: float = 0.0  # seconds spent in General.plan() by both generals
+    # temps de décision par tick de chaque général (ms) et décisions hors budget
+    decide_ms_mean1: float = 0.0
+    decide_ms_max1: float = 0.0
+    decide_ms_mean2: float = 0.0
+    decide_ms_max2: float = 0.0
+    over_budget1: int = 0
+    over_budget2: int = 0
+    forfeited: str = ""  # général qui a perdu par forfait (budget dépassé)
 
     def summary_line(self) -> str:
         return (
             f"{self.scenario}: {self.general1_name} vs {self.general2_name} -> "
-            f"{self.winner} (ticks={self.ticks}, survivors {self.army1_survivors}/{self.army2_survivors})"
+            f"{self.winner}{' (forfeit)' if self.forfeited else ''} "
+            f"(ticks={self.ticks}, survivors {self.army1_survivors}/{self.army2_survivors})"
         )
 
 
@@ -80,6 +93,18 @@ class TournamentResult:
             lines.append(
                 f"  {name:>15}: {stats.wins}/{stats.games} wins ({stats.pct():.1f}% | {stats.draws} draw)"
             )
+        saved = sum(match.decisions_saved for match in self.matches)
+        plan_time = sum(match.plan_time for match in self.matches)
+        if saved or plan_time:
+            lines.append("")
+        if saved:
+            lines.append(f"Re-decisions saved by sticky targets: {saved}")
+        if plan_time:
+            lines.append(f"Time spent in strategic planning: {plan_time:.2f}s")
+        lines.append("")
+        lines.append("Decision time per tick:")
+        for name, (mean_ms, max_ms, over) in _decision_times(self.matches, self.generals).items():
+            lines.append(f"  {name:>15}: mean {mean_ms:.2f} ms, worst {max_ms:.2f} ms, {over} over budget")
         lines.append("")
         lines.append("Recent matches:")
         for match in self.matches[-5:]:
@@ -122,7 +147,7 @@ def _compute_stats(
     general_vs_scenario = {scenario: {g: ScoreCounter() for g in generals} for scenario in scenarios}
 
     def outcome(row: str, winner: str) -> str:
-        if winner == "Draw":
+        if winner in ("Draw", "Stalemate"):
             return "draw"
         if winner == row:
             return "win"
@@ -167,13 +192,40 @@ def _compute_stats(
     return totals, vs_general, per_scenario, general_vs_scenario
 
 
+def _decision_times(matches: Sequence[MatchResult], generals: Sequence[str]) -> Dict[str, Tuple[float, float, int]]:
+    """Per general: mean of the per-match mean decision times, worst decision, decisions over budget."""
+    means: Dict[str, List[float]] = {name: [] for name in generals}
+    worst: Dict[str, float] = {name: 0.0 for name in generals}
+    over: Dict[str, int] = {name: 0 for name in generals}
+    for match in matches:
+        for name, mean_ms, max_ms, count in (
+            (match.general1_name, match.decide_ms_mean1, match.decide_ms_max1, match.over_budget1),
+            (match.general2_name, match.decide_ms_mean2, match.decide_ms_max2, match.over_budget2),
+        ):
+            if name not in means:
+                continue
+            means[name].append(mean_ms)
+            worst[name] = max(worst[name], max_ms)
+            over[name] += count
+    return {
+        name: (sum(means[name]) / len(means[name]) if means[name] else 0.0, worst[name], over[name])
+        for name in generals
+    }
+
+
 def _determine_winner(battle: Battle, general1_name: str, general2_name: str) -> str:
+    if battle.forfeited is battle.army1:
+        return general2_name
+    if battle.forfeited is battle.army2:
+        return general1_name
     army1_empty = battle.army1.isEmpty()
     army2_empty = battle.army2.isEmpty()
     if not army1_empty and army2_empty:
         return general1_name
     if not army2_empty and army1_empty:
         return general2_name
+    if battle.stalemate:
+        return "Stalemate"
     if battle.max_tick and battle.tick >= battle.max_tick:
         return "Draw"
     if army1_empty and army2_empty:
@@ -193,6 +245,11 @@ def _run_match(
     use_pygame: bool,
     assets_dir: Optional[str],
     verbose: bool,
+    stalemate_ticks: Optional[int] = None,
+    sticky_targets: bool = False,
+    decision_budget: Optional[float] = None,
+    budget_mode: str = "warn",
+    influence_every: Optional[int] = None,
 ) -> MatchResult:
     builder = get_scenario_builder(scenario_name)
     game_map, army1, army2 = builder()
@@ -201,12 +258,18 @@ def _run_match(
     general2_cls = GENERAL_REGISTRY[general2_name]
     general1 = general1_cls()
     general2 = general2_cls()
+    if sticky_targets:
+        general1.sticky_targets = general2.sticky_targets = True
 
     battle = Battle()
     battle.max_tick = max_ticks
     battle.tick_delay = max(0.0, delay)
     battle.frame_delay = 0.0 if headless else battle.frame_delay
     battle.verbose = verbose
+    battle.stalemate_ticks = stalemate_ticks
+    battle.decision_budget = decision_budget
+    battle.budget_mode = budget_mode
+    battle.influence_every = influence_every
 
     battle.map = game_map
     battle.army1 = army1
@@ -220,19 +283,37 @@ def _run_match(
     affichage = _display_factory(headless, use_curses, use_pygame, assets_dir)
     battle.affichage = affichage
 
-    battle.launch()
-    battle.gameLoop()
-    battle.end()
+    if isinstance(affichage, NoAffiche):
+        # nothing to draw: skip the display/timer loop entirely
+        battle.run_headless(max_ticks)
+    else:
+        battle.launch()
+        battle.gameLoop()
+        battle.end()
 
     winner = _determine_winner(battle, general1_name, general2_name)
+    timer1, timer2 = general1.timer, general2.timer
+    forfeited = ""
+    if battle.forfeited is not None:
+        forfeited = general1_name if battle.forfeited is battle.army1 else general2_name
     return MatchResult(
         scenario=scenario_name,
         general1_name=general1_name,
         general2_name=general2_name,
         winner=winner,
         ticks=battle.tick,
-        army1_survivors=len(battle.army1.living_units()),
-        army2_survivors=len(battle.army2.living_units()),
+        army1_survivors=battle.army1.alive_count(),
+        army2_survivors=battle.army2.alive_count(),
+        ticks_per_sec=battle.ticks_per_sec,
+        decisions_saved=sum(g.retargeter.kept for g in (general1, general2) if g.retargeter is not None),
+        plan_time=battle.planning_time(),
+        decide_ms_mean1=timer1.mean * 1000,
+        decide_ms_max1=timer1.worst * 1000,
+        decide_ms_mean2=timer2.mean * 1000,
+        decide_ms_max2=timer2.worst * 1000,
+        over_budget1=timer1.over_budget,
+        over_budget2=timer2.over_budget,
+        forfeited=forfeited,
     )
 
 
@@ -249,6 +330,11 @@ def run_tournament(
     assets_dir: Optional[str] = None,
     headless: bool = True,
     quiet: bool = False,
+    stalemate_ticks: Optional[int] = 100,
+    sticky_targets: bool = False,
+    decision_budget: Optional[float] = None,
+    budget_mode: str = "warn",
+    influence_every: Optional[int] = None,
 ) -> TournamentResult:
     if generals is None:
         generals = list(GENERAL_REGISTRY.keys())
@@ -259,6 +345,9 @@ def run_tournament(
         if name not in GENERAL_REGISTRY:
             raise ValueError(f"Unknown general '{name}'. Available: {', '.join(GENERAL_REGISTRY)}")
 
+    if budget_mode not in BUDGET_MODES:
+        raise ValueError(f"Unknown budget mode '{budget_mode}'. Available: {', '.join(BUDGET_MODES)}")
+
     for scenario in scenarios:
         if scenario not in SCENARIO_REGISTRY:
             raise ValueError(
@@ -291,6 +380,11 @@ def run_tournament(
                     use_pygame=use_pygame,
                     assets_dir=assets_dir,
                     verbose=not quiet,
+                    stalemate_ticks=stalemate_ticks,
+                    sticky_targets=sticky_targets,
+                    decision_budget=decision_budget,
+                    budget_mode=budget_mode,
+                    influence_every=influence_every,
                 )
                 matches.append(result)
                 if not quiet:
@@ -359,6 +453,12 @@ def generate_html_report(result: TournamentResult, output_path: str) -> None:
     for scenario in result.scenarios:
         matrix_section(f"General vs General - {scenario}", result.vs_general_per_scenario[scenario])
 
+    html.append("<div class='section'><h2>Decision Time per Tick</h2>")
+    html.append("<table><tr><th>General</th><th>Mean (ms)</th><th>Worst (ms)</th><th>Over budget</th></tr>")
+    for general, (mean_ms, max_ms, over) in _decision_times(result.matches, result.generals).items():
+        html.append(f"<tr><th>{general}</th><td>{mean_ms:.2f}</td><td>{max_ms:.2f}</td><td>{over}</td></tr>")
+    html.append("</table></div>")
+
     html.append("<div class='section'><h2>General vs Scenario</h2>")
     html.append("<table><tr><th>Scenario</th>")
     for general in result.generals:
@@ -373,7 +473,7 @@ def generate_html_report(result: TournamentResult, output_path: str) -> None:
     html.append("</table></div>")
 
     html.append("<div class='section'><h2>Match Log</h2>")
-    html.append("<table><tr><th>#</th><th>Scenario</th><th>General 1</th><th>General 2</th><th>Winner</th><th>Ticks</th><th>Survivors</th></tr>")
+    html.append("<table><tr><th>#</th><th>Scenario</th><th>General 1</th><th>General 2</th><th>Winner</th><th>Ticks</th><th>Ticks/s</th><th>Kept targets</th><th>Decide ms P1 (mean/max)</th><th>Decide ms P2 (mean/max)</th><th>Over budget</th><th>Survivors</th></tr>")
     for idx, match in enumerate(result.matches, 1):
         html.append(
             "<tr>"
@@ -381,8 +481,13 @@ def generate_html_report(result: TournamentResult, output_path: str) -> None:
             f"<td>{match.scenario}</td>"
             f"<td>{match.general1_name}</td>"
             f"<td>{match.general2_name}</td>"
-            f"<td>{match.winner}</td>"
+            f"<td>{match.winner}{' (forfeit)' if match.forfeited else ''}</td>"
             f"<td>{match.ticks}</td>"
+            f"<td>{match.ticks_per_sec:.1f}</td>"
+            f"<td>{match.decisions_saved}</td>"
+            f"<td>{match.decide_ms_mean1:.2f} / {match.decide_ms_max1:.2f}</td>"
+            f"<td>{match.decide_ms_mean2:.2f} / {match.decide_ms_max2:.2f}</td>"
+            f"<td>{match.over_budget1 + match.over_budget2}</td>"
             f"<td>{match.army1_survivors}/{match.army2_survivors}</td>"
             "</tr>"
         )
@@ -463,6 +568,11 @@ def run_tournament_cli(args) -> Optional[TournamentResult]:
         assets_dir=args.assets_dir,
         headless=args.headless or (not args.use_curses and not args.use_pygame),
         quiet=args.quiet,
+        stalemate_ticks=getattr(args, "stalemate_ticks", 100) or None,
+        sticky_targets=getattr(args, "sticky_targets", False),
+        decision_budget=(args.decision_budget / 1000) if getattr(args, "decision_budget", None) else None,
+        budget_mode=getattr(args, "budget_mode", "warn"),
+        influence_every=getattr(args, "influence_every", 0) or None,
     )
 
     print("\n" + result.summary_text())
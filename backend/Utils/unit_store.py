@@ -0,0 +1,151 @@
+"""
+Optional structure-of-arrays storage for the units of a battle.
+Positions, hp, reload deadline (ready_at) and unit type live in contiguous NumPy arrays (one row
+per unit); attached Unit objects become thin views that read and write their
+row, so the generals keep using the usual attributes while vectorised code can
+work on the arrays directly.
+
+NumPy is optional: UnitStore raises ImportError when it is not installed and
+Battle falls back to plain Python units.
+"""
+try:
+    import numpy as np
+except ImportError:  # the rest of the game does not need numpy
+    np = None
+
+
+# stable integer code per unit type, used for the `kind` column
+UNIT_TYPE_CODES = {
+    "Knight": 0,
+    "Pikeman": 1,
+    "Crossbowman": 2,
+    "Monk": 3,
+    "Elephant": 4,
+    "Castle": 5,
+}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class UnitStore:
+
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("numpy is required for UnitStore")
+        capacity = max(1, capacity)
+        self.count = 0
+        self._pos = np.zeros((capacity, 2), dtype=np.float64)
+        self._has_pos = np.zeros(capacity, dtype=bool)
+        self._hp = np.zeros(capacity, dtype=np.int64)
+        self._ready_at = np.zeros(capacity, dtype=np.int64)
+        self._kind = np.full(capacity, -1, dtype=np.int16)
+        self.units = []  # row -> Unit
+
+    @classmethod
+    def from_armies(cls, armies) -> "UnitStore":
+        armies = [a for a in armies if a is not None]
+        store = cls(sum(len(a.units) for a in armies))
+        for army in armies:
+            for unit in army.units:
+                store.attach(unit)
+        return store
+
+    # --- vues sur les lignes utilisées ---------------------------------------
+    @property
+    def positions(self):
+        return self._pos[:self.count]
+
+    @property
+    def has_position(self):
+        return self._has_pos[:self.count]
+
+    @property
+    def hp(self):
+        return self._hp[:self.count]
+
+    @property
+    def ready_at(self):
+        return self._ready_at[:self.count]
+
+    @property
+    def kind(self):
+        return self._kind[:self.count]
+
+    def alive_mask(self):
+        return self.hp > 0
+
+    def rows_of(self, units):
+        return np.fromiter((u._row for u in units), dtype=np.intp)
+
+    # --- attache / détache ----------------------------------------------------
+    def _grow(self):
+        capacity = len(self._hp) * 2
+        for name in ("_pos", "_has_pos", "_hp", "_ready_at", "_kind"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def attach(self, unit) -> int:
+        """Copy the unit state into a new row and turn the unit into a view on it."""
+        if unit._store is self:
+            return unit._row
+        if unit._store is not None:
+            unit._store.detach(unit)
+        if self.count == len(self._hp):
+            self._grow()
+        row = self.count
+        position = unit.position
+        if position is not None:
+            self._pos[row] = position
+        self._has_pos[row] = position is not None
+        self._hp[row] = unit.hp
+        self._ready_at[row] = unit.ready_at
+        self._kind[row] = UNIT_TYPE_CODES.get(unit.unit_type(), -1)
+        self.units.append(unit)
+        self.count += 1
+        unit._store, unit._row = self, row
+        return row
+
+    def detach(self, unit):
+        """Copy the row back into the unit so it works again without the store."""
+        if unit._store is not self:
+            return
+        row = unit._row
+        position, hp, ready_at = self.get_position(row), self.get_hp(row), self.get_ready_at(row)
+        self.units[row] = None
+        unit._store, unit._row = None, -1
+        unit._position, unit._hp, unit._ready_at = position, hp, ready_at
+
+    def detach_all(self):
+        for unit in self.units:
+            if unit is not None:
+                self.detach(unit)
+
+    # --- accès ligne par ligne (utilisés par les propriétés de Unit) ---------
+    def get_position(self, row):
+        if not self._has_pos[row]:
+            return None
+        x, y = self._pos[row].tolist()
+        return x, y
+
+    def set_position(self, row, position):
+        if position is None:
+            self._has_pos[row] = False
+            return
+        self._pos[row] = position
+        self._has_pos[row] = True
+
+    def get_hp(self, row):
+        return int(self._hp[row])
+
+    def set_hp(self, row, value):
+        self._hp[row] = value
+
+    def get_ready_at(self, row):
+        return int(self._ready_at[row])
+
+    def set_ready_at(self, row, value):
+        self._ready_at[row] = value
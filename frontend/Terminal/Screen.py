@@ -467,9 +467,13 @@ class Screen(Affichage):
         tick = getattr(self.gameMode, "tick", 0)
         lines = [
             f"Tick {tick} | {'PAUSED' if self.paused else 'RUNNING'}",
-            f"Army1: {len(army1.living_units())}/{len(army1.units)} alive",
-            f"Army2: {len(army2.living_units())}/{len(army2.units)} alive",
+            f"Army1: {army1.alive_count()}/{len(army1.units)} alive",
+            f"Army2: {army2.alive_count()}/{len(army2.units)} alive",
         ]
+        tramples1 = getattr(army1, "event_counts", {}).get("trample", 0)
+        tramples2 = getattr(army2, "event_counts", {}).get("trample", 0)
+        if tramples1 or tramples2:
+            lines.append(f"Tramples: {tramples1}/{tramples2}")
         general1 = getattr(army1, "general", None)
         general2 = getattr(army2, "general", None)
         if general1:
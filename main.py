@@ -74,6 +74,10 @@ def main():
         "--max-ticks", "-t", type=int, default=500,
         help="Maximum ticks per simulation (default: 500)"
     )
+    plot_parser.add_argument(
+        "--stalemate-ticks", type=int, default=100,
+        help="Stop a simulation after this many ticks without movement or damage (default: 100, 0 to disable)"
+    )
     plot_parser.add_argument(
         "--graph", "-g", dest="graph_path", type=str, default="lanchester.png",
         help="Output path for the PNG graph (default: lanchester.png)"
@@ -109,6 +113,26 @@ def main():
         "--ticks", "-t", type=int, default=500,
         help="Maximum ticks per match (default: 500)"
     )
+    tournament_parser.add_argument(
+        "--stalemate-ticks", type=int, default=100,
+        help="End a match as a stalemate after this many ticks without movement or damage (default: 100, 0 to disable)"
+    )
+    tournament_parser.add_argument(
+        "--sticky-targets", action="store_true",
+        help="Let generals keep last tick's targets while they stay valid (reports re-decisions saved)"
+    )
+    tournament_parser.add_argument(
+        "--decision-budget", type=float, default=None,
+        help="Time budget in milliseconds for each general decision (default: no limit)"
+    )
+    tournament_parser.add_argument(
+        "--budget-mode", choices=("warn", "fallback", "forfeit"), default="warn",
+        help="What to do when a general goes over its budget: warn, replay last tick's orders, or forfeit (default: warn)"
+    )
+    tournament_parser.add_argument(
+        "--influence-every", type=int, default=0,
+        help="Maintain NumPy influence maps for the generals, refreshed every N ticks (default: 0, off)"
+    )
     tournament_parser.add_argument(
         "--curses", action="store_true", dest="use_curses",
         help="Use the curses terminal display"
@@ -210,13 +234,14 @@ def main():
             general_cls=general_cls,
             repeats=args.repeat,
             max_ticks=args.max_ticks,
+            stalemate_ticks=args.stalemate_ticks or None,
         )
 
         print("\nLanchester plot dataset (averaged per (type, N)):")
         for row in dataset:
             print(
                 f"type={row['unit_type']:>9} | N={row['N']:>4} | "
-                f"winner={row['winner']:>8} | "
+                f"winner={row['winner']:>9} | "
                 f"casualties_winner={row['casualties_winner']:>4} | "
                 f"ticks_avg={row['ticks_avg']:.2f}"
             )